@@ -0,0 +1,80 @@
+"""Cost of the camel case split and join, per name, before and after the
+batched nameUtils.splitCamelCases / joinCamelCases. Runs without Maya, no
+stand-in is installed.
+
+    python benchmarks/benchCamelCase.py [names]
+"""
+# Python libraries
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# RigIO libraries
+import nameUtils
+
+assert 'maya' not in sys.modules, 'nameUtils must not import Maya'
+
+
+def legacySplitCamelCase(strArg):
+    """AbstractNameConvention.splitCamelCase as it was, one uncompiled
+    re.findall per call.
+    """
+    return re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)|[0-9]+', strArg)
+
+
+def legacyJoinCamelCase(*strArgs):
+    """AbstractNameConvention.joinCamelCase as it was, one str.replace per
+    token.
+    """
+    return strArgs[0]+''.join(
+        [i.replace(i[0], i[0].upper()) for i in strArgs[1:]])
+
+
+def syntheticNames(count):
+    """Return count camel case names, built from a small vocabulary as the
+    auto-naming names are.
+
+    :rtype: list of str
+    """
+    words = ('arm', 'Leg', 'Upper', 'Lower', 'Twist', 'Roll', 'FK', 'IK',
+             'Pole', 'Spine', 'Finger', 'Thumb')
+    return ['%s%s%s%02d' % (words[index % 12].lower(),
+                            words[index // 12 % 12], words[index // 7 % 12],
+                            index % 5)
+            for index in range(count)]
+
+
+def main(count=200000):
+    names = syntheticNames(count)
+    splits = [legacySplitCamelCase(name) for name in names]
+
+    def legacySplit():
+        return [legacySplitCamelCase(name) for name in names]
+
+    def legacyJoin():
+        return [legacyJoinCamelCase(*split) for split in splits]
+
+    def batchSplit():
+        return nameUtils.splitCamelCases(names)
+
+    def batchJoin():
+        return nameUtils.joinCamelCases(splits)
+
+    for label, before, after in (('split', legacySplit, batchSplit),
+                                 ('join', legacyJoin, batchJoin)):
+        timings = [min(timeit.repeat(func, number=1, repeat=3))
+                   for func in (before, after)]
+        print('%-5s : before %5.2f us / name, after %5.2f us / name' % (
+            label, timings[0] / count * 1e6, timings[1] / count * 1e6))
+
+    # 'llama' has its first letter repeated, str.replace upper cased both.
+    print('join  : %r before, %r after' % (
+        legacyJoinCamelCase('big', 'llama'),
+        nameUtils.joinCamelCases([('big', 'llama')])[0]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
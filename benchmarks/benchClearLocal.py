@@ -0,0 +1,83 @@
+"""Cost of xform.clearLocal on many transforms, before and after the bulk
+reset, against the maya.cmds stand-in. One transform out of four has a
+locked or connected channel.
+
+The stand-in commands are nearly free, so the number of setAttr calls is the
+figure to compare. The second run charges each command an assumed cost
+(30 us by default) to show what the round trips weigh in a Maya session.
+
+    python benchmarks/benchClearLocal.py [transforms] [commandCostUs]
+"""
+# Python libraries
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mayaStandIn
+mayaStandIn.install()
+
+# Maya libraries
+import maya.cmds as mc
+
+# RigIO libraries
+import xform
+
+
+def legacyClearLocal(transforms, t=True, r=True, s=True):
+    """xform.clearLocal as it was before the bulk reset, one set per axis
+    per channel in a bare try/except. pymel Attribute.set is replaced by the
+    setAttr it runs.
+    """
+    for transform in transforms:
+        for axis in 'XYZ':
+            if t:
+                try:
+                    mc.setAttr(transform+'.translate'+axis, 0)
+                except:
+                    pass
+            if r:
+                try:
+                    mc.setAttr(transform+'.rotate'+axis, 0)
+                except:
+                    pass
+            if s:
+                try:
+                    mc.setAttr(transform+'.scale'+axis, 1)
+                except:
+                    pass
+
+
+def buildScene(count):
+    mayaStandIn.SCENE.clear()
+    transforms = []
+    for index in range(count):
+        name = mayaStandIn.SCENE.createNode('transform', 'ctrl%d' % index)
+        node = mayaStandIn.SCENE.find(name)[0]
+        if index % 8 == 1:
+            node.locked.add('translateY')
+        elif index % 8 == 5:
+            node.connected.add('rotate')
+        transforms.append(name)
+    return transforms
+
+
+def main(count=5000, commandCost=30):
+    for cost in (0, commandCost):
+        mayaStandIn.setCommandCost(cost * 1e-6)
+        print('command cost : %d us' % cost)
+
+        for label, clearLocal in (('before', legacyClearLocal),
+                                  ('after', xform.clearLocal)):
+            transforms = buildScene(count)
+            start = time.time()
+            clearLocal(transforms)
+            elapsed = time.time() - start
+            print('    %-6s : %7.3f s, %6d setAttr calls' % (
+                label, elapsed, mayaStandIn.CALLS['setAttr']))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
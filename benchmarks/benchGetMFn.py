@@ -0,0 +1,64 @@
+"""Per node cost of openMayaUtils._getMFn, before and after the api type to
+function set index, against the maya.api.OpenMaya stand-in.
+
+    python benchmarks/benchGetMFn.py [nodes]
+"""
+# Python libraries
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mayaStandIn
+mayaStandIn.install()
+
+# Maya libraries
+import maya.api.OpenMaya as om
+
+# RigIO libraries
+import openMayaUtils
+
+
+def legacyGetMFn(apiNode):
+    """openMayaUtils._getMFn as it was before the index, walking dir(om.MFn)
+    and dir(om) for every node.
+    """
+    kType = apiNode.apiType()
+    MFn = lambda *args, **kwargs: None
+
+    if apiNode.hasFn(kType):
+        apiTypeStr = ''
+        for i in dir(om.MFn):
+            if kType == om.MFn.__getattribute__(om.MFn, i):
+                apiTypeStr = i
+
+        fnName = 'MFn'+apiTypeStr[1:]
+        if fnName in dir(om):
+            MFn = om.__dict__[fnName]
+
+    return MFn(apiNode)
+
+
+def main(count=2000):
+    typeNames = ('transform', 'joint', 'mesh', 'locator', 'unknownPlugin')
+    names = [mayaStandIn.SCENE.createNode(
+        typeNames[index % len(typeNames)], 'node%d' % index)
+        for index in range(count)]
+    mObjects = openMayaUtils.getMObject(names)
+
+    results = []
+    for label, getMFn in (('before', legacyGetMFn),
+                          ('after', openMayaUtils._getMFn)):
+        elapsed = min(timeit.repeat(
+            lambda: [getMFn(mObject) for mObject in mObjects],
+            number=1, repeat=3))
+        results.append(elapsed)
+        print('%-6s : %8.2f us / node' % (label, elapsed / count * 1e6))
+
+    print('speedup : %.0fx' % (results[0] / results[1]))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
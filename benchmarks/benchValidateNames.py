@@ -0,0 +1,61 @@
+"""Cost of nameUtils.validateNames on a synthetic scene-wide name list, with
+dag paths and namespaces. Runs without Maya, no stand-in is installed.
+
+    python benchmarks/benchValidateNames.py [names]
+"""
+# Python libraries
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# RigIO libraries
+import nameUtils
+from constants import SIDES, TYPES
+
+assert 'maya' not in sys.modules, 'nameUtils must not import Maya'
+
+
+def syntheticNames(count):
+    """Return count node names, about one out of five breaking a rule.
+
+    :rtype: list of str
+    """
+    sides = sorted(SIDES.values())
+    types = sorted(TYPES.values())
+    broken = ('x_arm_jnt_1', 'l_arm_foo_1', 'l_arm_jnt_a', 'l_arm!_jnt_1',
+              'pCube1')
+
+    names = []
+    for index in range(count):
+        if index % 5 == 4:
+            name = broken[index // 5 % len(broken)]
+        else:
+            name = '%s_limb%d_%s_%d' % (
+                sides[index % len(sides)], index % 97,
+                types[index % len(types)], index % 10)
+        if index % 3 == 0:
+            name = '|rig|ctrls|'+name
+        elif index % 3 == 1:
+            name = 'char:'+name
+        names.append(name)
+
+    return names
+
+
+def main(count=1000000):
+    names = syntheticNames(count)
+
+    start = time.time()
+    report = nameUtils.validateNames(names)
+    elapsed = time.time() - start
+
+    print('%d names in %.2f s (%.2f us / name)' % (
+        report['total'], elapsed, elapsed / report['total'] * 1e6))
+    for tag in sorted(report['invalid']):
+        print('    %-6s : %d invalid' % (tag, len(report['invalid'][tag])))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
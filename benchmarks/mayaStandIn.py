@@ -0,0 +1,466 @@
+"""In-memory stand-ins of maya.cmds, maya.api.OpenMaya and pymel.core, for
+the rigIO benchmarks to run outside of Maya.
+
+Only the calls made by the benchmarked code paths are implemented. The
+stand-ins hold a small scene of named nodes and count the maya.cmds calls,
+so the benchmarks can report the number of round trips next to the timings.
+
+:Example:
+    import mayaStandIn
+    mayaStandIn.install()
+
+    import xform
+    mayaStandIn.SCENE.createNode('transform', 'ctrl')
+"""
+# Python libraries
+import sys
+import time
+import types
+from collections import defaultdict
+
+__all__ = [
+    'SCENE',
+    'CALLS',
+    'setCommandCost',
+    'install',
+]
+
+# Number of calls of each maya.cmds stand-in command.
+CALLS = defaultdict(int)
+
+# Time spent by each maya.cmds stand-in call, see setCommandCost.
+_COMMAND_COST = [0.0]
+
+# Node type name to (api type name, api type names of its hasFn chain).
+_NODE_TYPES = {
+    'transform': ('kTransform', ('kBase', 'kDependencyNode', 'kDagNode')),
+    'joint': ('kJoint', ('kBase', 'kDependencyNode', 'kDagNode',
+                         'kTransform')),
+    'locator': ('kLocator', ('kBase', 'kDependencyNode', 'kDagNode',
+                             'kShape')),
+    'mesh': ('kMesh', ('kBase', 'kDependencyNode', 'kDagNode', 'kShape',
+                       'kSurface')),
+    'network': ('kNetwork', ('kBase', 'kDependencyNode')),
+    'unknownPlugin': ('kPluginDependNode', ('kBase', 'kDependencyNode')),
+}
+
+# Number of filler MFn constants and function sets, a Maya session has about
+# 1100 MFn constants and 300 names in maya.api.OpenMaya.
+_MFN_FILLERS = 1100
+_OM_FILLERS = 250
+
+_COMPOUNDS = {
+    'translate': (0.0, 'XYZ'),
+    'rotate': (0.0, 'XYZ'),
+    'scale': (1.0, 'XYZ'),
+}
+
+
+class _Node(object):
+
+    def __init__(self, typeName, name, parent=None):
+        self.typeName = typeName
+        self.name = name
+        self.parent = parent
+        self.children = []
+        self.alive = True
+        self.locked = set()
+        self.connected = set()
+        self.values = {}
+        for compound, (value, axes) in _COMPOUNDS.items():
+            for axis in axes:
+                self.values[compound+axis] = value
+
+    @property
+    def isDag(self):
+        return 'kDagNode' in _NODE_TYPES[self.typeName][1]
+
+    def fullPathName(self):
+        if not self.isDag:
+            return self.name
+        if self.parent is None:
+            return '|'+self.name
+        return self.parent.fullPathName()+'|'+self.name
+
+
+class _Scene(object):
+    """In-memory scene of named nodes."""
+
+    def __init__(self):
+        self.nodes = []
+        self._byName = defaultdict(list)
+
+    def clear(self):
+        for node in self.nodes:
+            node.alive = False
+        self.nodes = []
+        self._byName.clear()
+        CALLS.clear()
+
+    def createNode(self, typeName, name, parent=None):
+        """Create a node and return its name.
+
+        :param typeName: Node type name, a key of _NODE_TYPES.
+        :type typeName: str
+
+        :param name: Node name.
+        :type name: str
+
+        :param parent: Full path name of the parent, defaults to None
+        :type parent: str, optional
+
+        :rtype: str
+        """
+        parentNode = self.find(parent)[0] if parent else None
+        node = _Node(typeName, name, parentNode)
+        if parentNode is not None:
+            parentNode.children.append(node)
+        self.nodes.append(node)
+        self._byName[name].append(node)
+        return node.fullPathName()
+
+    def find(self, name):
+        """Return the nodes matching the given name, a full path name, a
+        partial path name or a leaf name.
+
+        :rtype: list of _Node
+        """
+        if '.' in name:
+            name = name.split('.')[0]
+        nodes = [node for node in self._byName.get(name.split('|')[-1], ())
+                 if node.alive]
+        if name.startswith('|'):
+            return [node for node in nodes if node.fullPathName() == name]
+        if '|' in name:
+            return [node for node in nodes
+                    if node.fullPathName().endswith('|'+name)]
+        return nodes
+
+
+SCENE = _Scene()
+
+# Source node of the connected plugs, see _Node.connected.
+_DRIVER = _Node('network', 'driver')
+
+
+# maya.api.OpenMaya ###############################################################
+
+def _buildOpenMaya():
+    om = types.ModuleType('maya.api.OpenMaya')
+
+    names = set(['kBase', 'kDependencyNode', 'kDagNode', 'kShape',
+                 'kSurface', 'kTransform', 'kJoint', 'kLocator', 'kMesh',
+                 'kNetwork', 'kPluginDependNode', 'kAnimCurve'])
+    names.update('kFillerType%04d' % i for i in range(_MFN_FILLERS))
+    MFn = type('MFn', (object,), dict(
+        (name, index) for index, name in enumerate(sorted(names))))
+    om.MFn = MFn
+
+    class MObject(object):
+        kNullObj = None
+
+        def __init__(self, node=None):
+            self._node = node
+
+        def isNull(self):
+            return self._node is None
+
+        def apiType(self):
+            return getattr(MFn, _NODE_TYPES[self._node.typeName][0])
+
+        def hasFn(self, apiType):
+            apiTypeName, chain = _NODE_TYPES[self._node.typeName]
+            return any(getattr(MFn, name) == apiType
+                       for name in (apiTypeName,) + chain)
+
+        def __eq__(self, other):
+            return isinstance(other, MObject) and self._node is other._node
+
+        def __ne__(self, other):
+            return not self == other
+
+    class MObjectHandle(object):
+
+        def __init__(self, mObject):
+            self._mObject = mObject
+
+        def isValid(self):
+            return self._mObject._node.alive
+
+        def isAlive(self):
+            return self._mObject._node.alive
+
+        def hashCode(self):
+            return id(self._mObject._node)
+
+        def object(self):
+            return self._mObject
+
+    class MDagPath(object):
+
+        def __init__(self, other=None):
+            self._node = other._node if other is not None else None
+
+        def isValid(self):
+            return self._node is not None and self._node.alive
+
+        def node(self):
+            return MObject(self._node)
+
+        def apiType(self):
+            return MObject(self._node).apiType()
+
+        def hasFn(self, apiType):
+            return MObject(self._node).hasFn(apiType)
+
+        def fullPathName(self):
+            return self._node.fullPathName()
+
+        def partialPathName(self):
+            return self._node.name
+
+    class MPlug(object):
+
+        def __init__(self, node, attribute):
+            self._node = node
+            self._attribute = attribute
+
+        @property
+        def isLocked(self):
+            return self._attribute in self._node.locked
+
+        @property
+        def isDestination(self):
+            return self._attribute in self._node.connected
+
+        def source(self):
+            return MPlug(_DRIVER, 'output')
+
+        def node(self):
+            return MObject(self._node)
+
+        def numChildren(self):
+            compound = _COMPOUNDS.get(self._attribute)
+            return len(compound[1]) if compound else 0
+
+        def child(self, index):
+            return MPlug(self._node,
+                         self._attribute+_COMPOUNDS[self._attribute][1][index])
+
+        def partialName(self, useLongNames=False, **kwargs):
+            return self._attribute
+
+    class MSelectionList(object):
+
+        def __init__(self):
+            self._nodes = []
+            self._ids = set()
+
+        def length(self):
+            return len(self._nodes)
+
+        def add(self, name):
+            nodes = SCENE.find(name)
+            if not nodes:
+                raise RuntimeError('kInvalidParameter: Object does not exist')
+            for node in nodes:
+                if id(node) not in self._ids:
+                    self._ids.add(id(node))
+                    self._nodes.append(node)
+            return self
+
+        def getDependNode(self, index):
+            return MObject(self._nodes[index])
+
+        def getDagPath(self, index):
+            path = MDagPath()
+            path._node = self._nodes[index]
+            return path
+
+    class MFnBase(object):
+
+        def __init__(self, apiNode=None):
+            self._node = apiNode._node if apiNode is not None else None
+
+        def setObject(self, apiNode):
+            self._node = apiNode._node
+            return self
+
+    class MFnDependencyNode(MFnBase):
+
+        @property
+        def typeName(self):
+            return self._node.typeName
+
+        def name(self):
+            return self._node.name
+
+        def absoluteName(self):
+            return ':'+self._node.name
+
+        def findPlug(self, attribute, wantNetworkedPlug):
+            return MPlug(self._node, attribute)
+
+    class MFnDagNode(MFnDependencyNode):
+
+        def fullPathName(self):
+            return self._node.fullPathName()
+
+    class MFnTransform(MFnDagNode):
+        pass
+
+    class MFnMesh(MFnDagNode):
+        pass
+
+    class _Message(object):
+        _nextId = 0
+
+        @classmethod
+        def _register(cls, *args):
+            _Message._nextId += 1
+            return _Message._nextId
+
+    class MMessage(_Message):
+
+        @staticmethod
+        def removeCallbacks(callbackIds):
+            pass
+
+    class MDGMessage(_Message):
+        addNodeAddedCallback = classmethod(lambda cls, *a: cls._register())
+        addNodeRemovedCallback = classmethod(lambda cls, *a: cls._register())
+
+    class MNodeMessage(_Message):
+        addNameChangedCallback = classmethod(lambda cls, *a: cls._register())
+
+    class MDagMessage(_Message):
+        addParentAddedCallback = classmethod(lambda cls, *a: cls._register())
+        addParentRemovedCallback = classmethod(
+            lambda cls, *a: cls._register())
+
+    class MSceneMessage(_Message):
+        kBeforeNew = 0
+        kBeforeOpen = 1
+        kAfterNew = 2
+        kAfterOpen = 3
+        addCallback = classmethod(lambda cls, *a: cls._register())
+
+    for cls in (MObject, MObjectHandle, MDagPath, MPlug, MSelectionList,
+                MFnBase, MFnDependencyNode, MFnDagNode, MFnTransform,
+                MFnMesh, MMessage, MDGMessage, MNodeMessage, MDagMessage,
+                MSceneMessage):
+        setattr(om, cls.__name__, cls)
+
+    for index in range(_OM_FILLERS):
+        name = 'MFnFillerType%04d' % index
+        setattr(om, name, type(name, (MFnBase,), {}))
+
+    return om
+
+
+# maya.cmds ######################################################################
+
+def setCommandCost(seconds):
+    """Set the time spent by each maya.cmds stand-in call, to model the
+    command dispatch and undo recording overhead of a Maya session.
+
+    :param seconds: Time per call, 0 to disable.
+    :type seconds: float
+    """
+    _COMMAND_COST[0] = seconds
+
+
+def _command(func):
+    def wrapper(*args, **kwargs):
+        CALLS[func.__name__] += 1
+        if _COMMAND_COST[0]:
+            end = time.time() + _COMMAND_COST[0]
+            while time.time() < end:
+                pass
+        return func(*args, **kwargs)
+    wrapper.__name__ = func.__name__
+    return wrapper
+
+
+def _buildCmds():
+    mc = types.ModuleType('maya.cmds')
+
+    @_command
+    def setAttr(plugName, *values, **kwargs):
+        nodes = SCENE.find(plugName)
+        if len(nodes) != 1:
+            raise RuntimeError('No object matches name: %s' % plugName)
+        node = nodes[0]
+        attribute = plugName.split('.')[-1]
+
+        compound = _COMPOUNDS.get(attribute)
+        attributes = [attribute+axis for axis in compound[1]] \
+            if compound else [attribute]
+        for name in attributes:
+            if name in node.locked or attribute in node.locked:
+                raise RuntimeError('The attribute %s is locked' % plugName)
+            if name in node.connected or attribute in node.connected:
+                raise RuntimeError('The attribute %s is connected'
+                                   % plugName)
+        for name, value in zip(attributes, values):
+            node.values[name] = value
+
+    @_command
+    def getAttr(plugName):
+        node = SCENE.find(plugName)[0]
+        return node.values[plugName.split('.')[-1]]
+
+    @_command
+    def ls(*args, **kwargs):
+        return [node.fullPathName() if kwargs.get('long') else node.name
+                for node in SCENE.nodes if node.alive]
+
+    @_command
+    def undoInfo(*args, **kwargs):
+        pass
+
+    @_command
+    def about(*args, **kwargs):
+        return True
+
+    @_command
+    def refresh(*args, **kwargs):
+        return False
+
+    @_command
+    def channelBox(*args, **kwargs):
+        return False
+
+    for command in (setAttr, getAttr, ls, undoInfo, about, refresh,
+                    channelBox):
+        setattr(mc, command.__name__, command)
+
+    return mc
+
+
+def install():
+    """Register the stand-in modules in sys.modules, in place of maya and
+    pymel.
+    """
+    if 'maya' in sys.modules and \
+            getattr(sys.modules['maya'], '__standIn__', False):
+        return
+
+    maya = types.ModuleType('maya')
+    maya.__standIn__ = True
+    maya.api = types.ModuleType('maya.api')
+    maya.api.OpenMaya = _buildOpenMaya()
+    maya.cmds = _buildCmds()
+
+    pymel = types.ModuleType('pymel')
+    pymel.core = types.ModuleType('pymel.core')
+    pymel.core.warning = lambda message: None
+
+    sys.modules.update({
+        'maya': maya,
+        'maya.api': maya.api,
+        'maya.api.OpenMaya': maya.api.OpenMaya,
+        'maya.cmds': maya.cmds,
+        'pymel': pymel,
+        'pymel.core': pymel.core,
+    })
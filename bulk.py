@@ -0,0 +1,155 @@
+# Python libraries
+import time
+import functools
+
+# Maya libraries
+import maya.cmds as mc
+
+__all__ = [
+    'BulkOperation',
+    'bulkOperation',
+    'timings',
+    'resetTimings',
+]
+
+# Time spent in each bulk operation.
+# {name: {'calls': int, 'total': float, 'last': float}}
+_TIMINGS = {}
+
+
+class BulkOperation(object):
+    """Context manager grouping many Maya edits in one bulk operation.
+
+    Open one undo chunk and suspend the refresh of the viewports and editors,
+    then restore everything on exit, even if an exception occurred, and update
+    the Channel Box once. Nested bulk operations only time themselves, the
+    outermost one does the refresh handling and the first one asking for an
+    undo chunk opens it.
+
+    :Example:
+        from rigIO.bulk import BulkOperation
+
+        with BulkOperation('myTool'):
+            ...
+    """
+
+    # Number of currently opened bulk operations.
+    _depth = 0
+
+    # True while a bulk operation holds an opened undo chunk.
+    _chunkOpened = False
+
+    def __init__(self, name='bulkOperation', undoChunk=True):
+        """x.__init__(name) <==> x(name)
+
+        :param name: Name used for the timing counters and the undo chunk.
+        :type name: str
+
+        :param undoChunk: If False, don't open an undo chunk, for the edits
+            Maya undo doesn't record, like the api modifiers ones,
+            defaults to True
+        :type undoChunk: bool, optional
+        """
+        self.name = name
+        self.undoChunk = undoChunk
+        self._start = None
+        self._suspended = False
+        self._ownsChunk = False
+
+    def __enter__(self):
+        BulkOperation._depth += 1
+        try:
+            if self.undoChunk and not BulkOperation._chunkOpened:
+                mc.undoInfo(openChunk=True, chunkName=self.name)
+                BulkOperation._chunkOpened = self._ownsChunk = True
+
+            if BulkOperation._depth == 1 and not mc.about(batch=True):
+                self._suspended = not mc.refresh(query=True, suspend=True)
+                if self._suspended:
+                    mc.refresh(suspend=True)
+        except:
+            # __exit__ won't be called, roll back what was done.
+            BulkOperation._depth -= 1
+            self._suspended = False
+            self._closeChunk()
+            raise
+
+        self._start = time.time()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.time() - self._start
+
+        timing = _TIMINGS.setdefault(
+            self.name, {'calls': 0, 'total': 0.0, 'last': 0.0})
+        timing['calls'] += 1
+        timing['total'] += elapsed
+        timing['last'] = elapsed
+
+        BulkOperation._depth -= 1
+        try:
+            if self._suspended:
+                mc.refresh(suspend=False)
+                self._suspended = False
+                # The Channel Box missed the updates while the refresh was
+                # suspended.
+                if mc.channelBox('mainChannelBox', exists=True):
+                    mc.channelBox('mainChannelBox', edit=True, update=True)
+        finally:
+            self._closeChunk()
+
+        return False
+
+    def _closeChunk(self):
+        if self._ownsChunk:
+            BulkOperation._chunkOpened = self._ownsChunk = False
+            mc.undoInfo(closeChunk=True)
+
+
+def bulkOperation(func=None, undoChunk=True):
+    """Decorator running the given function in a BulkOperation named after
+    the function.
+
+    :param func: Function to decorate.
+    :type func: function
+
+    :param undoChunk: See BulkOperation, defaults to True
+    :type undoChunk: bool, optional
+
+    :rtype: function
+
+    :Example:
+        @bulkOperation
+        def setValues(...):
+            ...
+
+        @bulkOperation(undoChunk=False)
+        def connectPlugs(...):
+            ...
+    """
+    if func is None:
+        return functools.partial(bulkOperation, undoChunk=undoChunk)
+
+    name = '%s.%s' % (func.__module__, func.__name__)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with BulkOperation(name, undoChunk=undoChunk):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def timings():
+    """Return the timing counters of the bulk operations.
+
+    :returns: Number of calls, total and last duration in seconds of each
+        bulk operation.
+    :rtype: dict{str:dict}
+    """
+    return dict((name, dict(timing)) for name, timing in _TIMINGS.items())
+
+
+def resetTimings():
+    """Reset the timing counters of the bulk operations."""
+    _TIMINGS.clear()
@@ -1,37 +1,464 @@
+# Python libraries
+import array
+import numbers
+import struct
+
+# Maya libraries
+import maya.cmds as mc
+import maya.api.OpenMaya as om
 import pymel.core as pm
 
+# RigIO libraries
+import openMayaUtils
+from bulk import bulkOperation
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 # Functions #########################################################################
 
-def setDefault(nodes, ignores=tuple()):
+@bulkOperation
+def setDefault(nodes, ignores=tuple(), returnValues=False):
     """Set the node(s) channelBox attributes(s) to there default value if there is.
-    Log a warning message if a RuntimeError occur during the set value process.
+
+    The defaults are read through the api attribute function sets and cached
+    per node type and attribute. Only the attributes not already at their
+    default value are set, in one bulk operation. The keyed attributes are set
+    as well, as pymel set does. Log a single warning message for the locked
+    or driven attribute(s) and the RuntimeError(s) occurring during the set
+    value process.
 
     :param nodes:
         OR Maya node(s) name.
         OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
     :type nodes:
         OR iterable of basestring
         OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
 
     :param ignores: Attribute(s) name to ignore during the process,
         defaults to tuple()
     :type ignores: Iterable of basestring, optional
 
+    :param returnValues: If True, return the changed values,
+        defaults to False
+    :type returnValues: bool, optional
+
+    :returns: If returnValues, the (previous, default) value of each changed
+        attribute of each node.
+    :rtype: dict{str:dict{str:tuple}} or None
+
    :Example:
         import maya.cmds as mc
         import rigIO.channelBox
 
         rigIO.channelBox.setDefault(mc.ls(sl=True), ['v'])
     """
-    for node in nodes:
-        channelBox = ChannelBox(node, *ignores)
-        channelBox.setDefault()
+    changes = []
+    warnings = []
+
+    for name, longName, plug in _channelBoxPlugs(nodes, ignores):
+        default = _attributeDefault(plug)
+        if default is None:
+            continue
+
+        value = _plugValue(plug, default)
+        default = _uiValue(default)
+        if value == default:
+            continue
+
+        if plug.isLocked or _isDriven(plug):
+            warnings.append(name+'.'+longName)
+            continue
+
+        changes.append((name, longName, value, default))
+
+    values = {}
+    for name, longName, value, default in changes:
+        try:
+            mc.setAttr(name+'.'+longName, default)
+        except RuntimeError:
+            warnings.append(name+'.'+longName)
+        else:
+            values.setdefault(name, {})[longName] = (value, default)
+
+    if warnings:
+        pm.warning('Unable to set the default value of : %s' %
+                   ', '.join(warnings))
+
+    if returnValues:
+        return values
+
+def _nodeName(node):
+    """Gets the name of the given node.
+
+    :param node:
+        OR Maya node name.
+        OR PyNode instance of Maya node.
+        OR ChannelBox instance.
+    :type node:
+        OR basestring
+        OR pymel.core.PyNode
+        OR ChannelBox
+
+    :rtype: str
+    """
+    if isinstance(node, ChannelBox):
+        node = node.node
+    return node if isinstance(node, basestring) else node.name()
+
+
+def _findPlug(nodeFn, attrName):
+    """Gets the MPlug of the given attribute name on the given node.
+
+    :param nodeFn: Function set of the node.
+    :type nodeFn: om.MFnDependencyNode
+
+    :param attrName: Attribute name, may be an element or child plug path.
+    :type attrName: str
+
+    :rtype: om.MPlug
+    """
+    try:
+        return nodeFn.findPlug(attrName, False)
+    except RuntimeError:
+        mSl = om.MSelectionList()
+        mSl.add(nodeFn.absoluteName()+'.'+attrName)
+        return mSl.getPlug(0)
+
+
+def _plugName(plug):
+    """Gets the unique name of the given plug, full dag path included.
+
+    :param plug: Api plug.
+    :type plug: om.MPlug
+
+    :rtype: str
+    """
+    node = plug.node()
+    if node.hasFn(om.MFn.kDagNode):
+        nodeName = om.MFnDagNode(node).fullPathName()
+    else:
+        nodeName = om.MFnDependencyNode(node).absoluteName()
+
+    return nodeName+'.'+plug.partialName(
+        includeNonMandatoryIndices=True, useFullAttributePath=True,
+        useLongNames=True)
+
+
+def _channelBoxPlugs(nodes, ignores=tuple()):
+    """Gets the channelBox plug(s) of all the given node(s) after the ignores
+    filter, the nodes are resolved in one batch.
+
+    :param nodes:
+        OR Maya node(s) name.
+        OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
+    :type nodes:
+        OR iterable of basestring
+        OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
+
+    :param ignores: Attribute(s) name to ignore during the process,
+        defaults to tuple()
+    :type ignores: Iterable of basestring, optional
+
+    :returns: Node name, attribute long name and MPlug of each attribute.
+    :rtype: generator of tuple(str, str, om.MPlug)
+    """
+    ignores = frozenset(ignores)
+    nodes = list(nodes)
+    names = [_nodeName(node) for node in nodes]
+
+    for node, name, mObject in zip(
+            nodes, names, openMayaUtils.getMObject(names)):
+        nodeIgnores = ignores
+        if isinstance(node, ChannelBox):
+            nodeIgnores = ignores.union(node.ignores)
+
+        nodeFn = om.MFnDependencyNode(mObject)
+        attributeNames, _ = ChannelBox._attributeNames(name)
+        for longName, shortName in attributeNames:
+            if longName in nodeIgnores or shortName in nodeIgnores:
+                continue
+            yield name, longName, _findPlug(nodeFn, longName)
+
+
+# Default value of the static attributes, {(nodeType, attribute): default}.
+_ATTRIBUTE_DEFAULTS = {}
+
+
+def _attributeDefault(plug):
+    """Gets the default value of the attribute of the given plug.
+
+    The default of the static attributes is cached per node type and
+    attribute, the dynamic attributes can have a different default per node.
+
+    :param plug: Api plug.
+    :type plug: om.MPlug
+
+    :returns: Default value, in internal units for the unit attributes, or
+        None if the attribute has no single default value.
+    :rtype: bool, int, float, om.MDistance, om.MAngle, om.MTime or None
+    """
+    key = None
+    if not plug.isDynamic:
+        typeName = om.MFnDependencyNode(plug.node()).typeName
+        key = (typeName, plug.partialName(useLongNames=True))
+        if key in _ATTRIBUTE_DEFAULTS:
+            return _ATTRIBUTE_DEFAULTS[key]
+
+    attr = plug.attribute()
+    default = None
+    if attr.hasFn(om.MFn.kNumericAttribute):
+        default = om.MFnNumericAttribute(attr).default
+        if not isinstance(default, numbers.Number):
+            default = None
+    elif attr.hasFn(om.MFn.kUnitAttribute):
+        default = om.MFnUnitAttribute(attr).default
+    elif attr.hasFn(om.MFn.kEnumAttribute):
+        default = om.MFnEnumAttribute(attr).default
+
+    if key is not None:
+        _ATTRIBUTE_DEFAULTS[key] = default
+
+    return default
+
+
+def _uiValue(value):
+    """Convert the given internal value to the current ui units.
+
+    :param value: Internal value.
+    :type value: bool, int, float, om.MDistance, om.MAngle or om.MTime
+
+    :rtype: bool, int or float
+    """
+    if isinstance(value, om.MDistance):
+        return value.asUnits(om.MDistance.uiUnit())
+    if isinstance(value, om.MAngle):
+        return value.asUnits(om.MAngle.uiUnit())
+    if isinstance(value, om.MTime):
+        return value.asUnits(om.MTime.uiUnit())
+    return value
+
+
+def _plugValue(plug, default):
+    """Gets the value of the given plug, in ui units, as the same type as the
+    given default value.
+
+    :param plug: Api plug.
+    :type plug: om.MPlug
+
+    :param default: Default value of the plug attribute.
+    :type default: bool, int, float, om.MDistance, om.MAngle or om.MTime
+
+    :rtype: bool, int or float
+    """
+    if isinstance(default, om.MDistance):
+        return _uiValue(plug.asMDistance())
+    if isinstance(default, om.MAngle):
+        return _uiValue(plug.asMAngle())
+    if isinstance(default, om.MTime):
+        return _uiValue(plug.asMTime())
+    if isinstance(default, bool):
+        return plug.asBool()
+    if isinstance(default, int):
+        return plug.asInt()
+    return plug.asDouble()
+
+
+def _isDriven(plug):
+    """Check if the given plug is the destination of a connection other than
+    an animation curve. A keyed plug can still be set, the value holds until
+    the curve is evaluated again.
+
+    :param plug: Api plug.
+    :type plug: om.MPlug
+
+    :rtype: bool
+    """
+    return plug.isDestination and \
+        not plug.source().node().hasFn(om.MFn.kAnimCurve)
 
+
+def _planConnections(source, destinations, ignores=tuple()):
+    """Compute the (source plug, destination plug) pairs to connect from the
+    source channelBox attribute(s) to the destination(s) channelBox
+    attribute(s).
+
+    :param source: Maya node name.
+    :type source: str
+
+    :param destinations: (Maya node name, attribute name(s) to ignore) of each
+        destination.
+    :type destinations: list of tuple(str, Iterable of basestring)
+
+    :param ignores: Source attribute(s) name to ignore, defaults to tuple()
+    :type ignores: Iterable of basestring, optional
+
+    :returns: Plan of the connections.
+        {
+            'connect': [(source MPlug, destination MPlug)],
+            'skipped': [(source plug name, destination plug name, reason)],
+            'failed': [(source plug name, destination plug name, message)],
+        }
+    :rtype: dict
+    """
+    plan = {'connect': [], 'skipped': [], 'failed': []}
+
+    ignores = frozenset(ignores)
+    _, sourceIndex = ChannelBox._attributeNames(source)
+    sourceFn = om.MFnDependencyNode(openMayaUtils.getMObject(source))
+    sourcePlugs = {}
+
+    destinationNodes = openMayaUtils.getMObject(
+        [name for name, _ in destinations])
+
+    for (destination, destinationIgnores), mObject in \
+            zip(destinations, destinationNodes):
+        destinationIgnores = ignores.union(destinationIgnores)
+        destinationFn = om.MFnDependencyNode(mObject)
+        names, _ = ChannelBox._attributeNames(destination)
+
+        for longName, shortName in names:
+            if longName in destinationIgnores or shortName in destinationIgnores:
+                continue
+
+            if longName not in sourceIndex:
+                continue
+
+            sourceName = source+'.'+longName
+            destinationName = destination+'.'+longName
+            try:
+                if longName not in sourcePlugs:
+                    sourcePlugs[longName] = _findPlug(sourceFn, longName)
+                sourcePlug = sourcePlugs[longName]
+                destinationPlug = _findPlug(destinationFn, longName)
+            except RuntimeError as error:
+                plan['failed'].append((sourceName, destinationName, str(error)))
+                continue
+
+            if destinationPlug == sourcePlug:
+                plan['skipped'].append(
+                    (sourceName, destinationName, 'same plug'))
+            elif not _isConnectable(sourcePlug, destinationPlug):
+                plan['skipped'].append(
+                    (sourceName, destinationName, 'not connectable'))
+            elif destinationPlug.isDestination and \
+                    destinationPlug.source() == sourcePlug:
+                plan['skipped'].append(
+                    (sourceName, destinationName, 'connected'))
+            elif destinationPlug.isLocked:
+                plan['skipped'].append(
+                    (sourceName, destinationName, 'locked'))
+            else:
+                plan['connect'].append((sourcePlug, destinationPlug))
+
+    return plan
+
+
+def _isConnectable(sourcePlug, destinationPlug):
+    """Check the source attribute is readable and the destination attribute
+    is writable, both being connectable.
+
+    :param sourcePlug: Source api plug.
+    :type sourcePlug: om.MPlug
+
+    :param destinationPlug: Destination api plug.
+    :type destinationPlug: om.MPlug
+
+    :rtype: bool
+    """
+    sourceFn = om.MFnAttribute(sourcePlug.attribute())
+    destinationFn = om.MFnAttribute(destinationPlug.attribute())
+    return sourceFn.readable and sourceFn.connectable and \
+        destinationFn.writable and destinationFn.connectable
+
+
+# Number of connections queued per MDGModifier, see _makeConnections.
+_CONNECTION_BATCH_SIZE = 256
+
+
+def _connectionModifier(connections):
+    """Queue the given connections on a new MDGModifier, replacing the
+    existing incoming connection of their destination.
+
+    :param connections: (source MPlug, destination MPlug, names) of each
+        connection.
+    :type connections: list of tuple
+
+    :rtype: om.MDGModifier
+    """
+    modifier = om.MDGModifier()
+    for sourcePlug, destinationPlug, _ in connections:
+        if destinationPlug.isDestination:
+            modifier.disconnect(destinationPlug.source(), destinationPlug)
+        modifier.connect(sourcePlug, destinationPlug)
+    return modifier
+
+
+def _makeConnections(connections, summary):
+    """Make the given connections by batches of one MDGModifier each.
+
+    MDGModifier.connect only queues a connection, its errors are raised by
+    doIt(). When a batch fails, it is undone and its connections are made one
+    by one, so the failed ones are reported on their own and keep their
+    previous incoming connection.
+
+    :param connections: (source MPlug, destination MPlug, names) of each
+        connection, the names are reported in the summary.
+    :type connections: list of tuple
+
+    :param summary: Summary to report the 'made' and 'failed' connections in.
+    :type summary: dict
+
+    :returns: Modifiers of the made connections, in the order they were done.
+    :rtype: list of om.MDGModifier
+    """
+    modifiers = []
+    for start in range(0, len(connections), _CONNECTION_BATCH_SIZE):
+        batch = connections[start:start + _CONNECTION_BATCH_SIZE]
+        modifier = _connectionModifier(batch)
+        try:
+            modifier.doIt()
+        except RuntimeError:
+            modifier.undoIt()
+        else:
+            modifiers.append(modifier)
+            summary['made'].extend(names for _, _, names in batch)
+            continue
+
+        for connection in batch:
+            modifier = _connectionModifier([connection])
+            try:
+                modifier.doIt()
+            except RuntimeError as error:
+                modifier.undoIt()
+                summary['failed'].append(connection[2]+(str(error),))
+            else:
+                modifiers.append(modifier)
+                summary['made'].append(connection[2])
+
+    return modifiers
+
+
+@bulkOperation(undoChunk=False)
 def connect(source, destinations, ignores=tuple()):
     """Connect current channelBox attribute(s) to the destination(s)
-    channelBox attribute(s). Log a warning message if a RuntimeError occurs
-    during the connection process.
+    channelBox attribute(s).
+
+    All the connections are planned first: already connected, locked, not
+    connectable and unmatched attributes are dropped, then the remaining
+    connections are made by batches of MDGModifier. As for pymel >>, an
+    existing incoming connection of a destination attribute is replaced. Log
+    a warning message if some connections failed.
+
+    Maya undo does not revert these connections, call undoIt() on the
+    returned modifiers, last one first, to revert them.
 
     :param source:
         OR Maya node name.
@@ -43,111 +470,454 @@ def connect(source, destinations, ignores=tuple()):
     :param destinations:
         OR Maya node(s) name.
         OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
     :type destinations:
         OR iterable of basestring
         OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
 
     :param ignores: Attribute(s) name to ignore during the process,
         defaults to tuple()
     :type ignores: Iterable of basestring, optional
 
+    :returns: Summary of the made, skipped and failed connections, and the
+        modifiers used to make them.
+        {
+            'made': [(source plug name, destination plug name)],
+            'skipped': [(source plug name, destination plug name, reason)],
+            'failed': [(source plug name, destination plug name, message)],
+            'modifiers': [om.MDGModifier],
+        }
+    :rtype: dict
+
    :Example:
         import maya.cmds as mc
         import rigIO.channelBox
 
         sl = mc.ls(sl=True)
-        rigIO.channelBox.connect(sl[0], sl[1:], ['v'])
+        summary = rigIO.channelBox.connect(sl[0], sl[1:], ['v'])
+
+        # Revert the connections.
+        for modifier in reversed(summary['modifiers']):
+            modifier.undoIt()
     """
-    sourceChannelBox = ChannelBox(source, *ignores)
-    sourceChannelBox.connect(*destinations)
+    destinations = [
+        (_nodeName(node),
+         node.ignores if isinstance(node, ChannelBox) else tuple())
+        for node in destinations]
+    plan = _planConnections(_nodeName(source), destinations, ignores)
+
+    summary = {'made': [], 'skipped': plan['skipped'], 'failed': plan['failed']}
+    summary['modifiers'] = _makeConnections(
+        [(sourcePlug, destinationPlug,
+          (sourcePlug.name(), destinationPlug.name()))
+         for sourcePlug, destinationPlug in plan['connect']],
+        summary)
+
+    if summary['failed']:
+        pm.warning('%d connection(s) failed : %s' % (
+            len(summary['failed']),
+            ', '.join('%s -> %s' % pair[:2] for pair in summary['failed'])))
+
+    return summary
+
+
+class DisconnectError(RuntimeError):
+    """Raised when rigIO.channelBox.disconnect fails, some of the connections
+    may already be broken.
 
+    :param message: Error message.
+    :type message: str
+
+    :param snapshot: Snapshot of all the connections to break, give it to
+        rigIO.channelBox.reconnect to restore the broken ones.
+    :type snapshot: tuple of tuple(source plug name, destination plug name)
+    """
+
+    def __init__(self, message, snapshot):
+        super(DisconnectError, self).__init__(message)
+        self.snapshot = snapshot
+
+
+@bulkOperation(undoChunk=False)
 def disconnect(nodes, ignores=tuple()):
-    """Disconnect the node(s) channelBox attribute(s).
-    Log a warning error if there is no incoming connection(s).
+    """Disconnect the incoming connection(s) of the node(s) channelBox
+    attribute(s).
+
+    The incoming connections of all the nodes are collected in one pass and
+    broken through a single MDGModifier. The returned snapshot can be given
+    to rigIO.channelBox.reconnect to restore the exact same connections.
+
+    Maya undo does not revert the disconnection, reconnect the snapshot
+    instead.
 
     :param nodes:
         OR Maya node(s) name.
         OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
     :type nodes:
         OR iterable of basestring
         OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
 
     :param ignores: Attribute(s) name to ignore during the process,
         defaults to tuple()
     :type ignores: Iterable of basestring, optional
 
+    :returns: Snapshot of the broken connections.
+    :rtype: tuple of tuple(source plug name, destination plug name)
+
+    :raises: DisconnectError, holding the snapshot, if the connections could
+        not all be broken.
+
    :Example:
         import maya.cmds as mc
         import rigIO.channelBox
 
-        rigIO.channelBox.disconnect(mc.ls(sl=True), ['v'])
+        snapshot = rigIO.channelBox.disconnect(mc.ls(sl=True), ['v'])
+        # ... bake ...
+        rigIO.channelBox.reconnect(snapshot)
     """
-    for node in nodes:
-        channelBox = ChannelBox(node, *ignores)
-        channelBox.disconnect()
+    snapshot = []
+    modifier = om.MDGModifier()
 
-def setLocked(nodes, value, ignores=tuple()):
-    """Delete the animation key(s) on the node chennelBox attribute(s).
+    for _, _, plug in _channelBoxPlugs(nodes, ignores):
+        if not plug.isDestination:
+            continue
+
+        sourcePlug = plug.source()
+        snapshot.append((_plugName(sourcePlug), _plugName(plug)))
+        modifier.disconnect(sourcePlug, plug)
+
+    snapshot = tuple(snapshot)
+    try:
+        modifier.doIt()
+    except RuntimeError as error:
+        raise DisconnectError(str(error), snapshot)
+
+    return snapshot
+
+@bulkOperation(undoChunk=False)
+def reconnect(snapshot):
+    """Restore the connections of a rigIO.channelBox.disconnect snapshot
+    by batches of MDGModifier. The connections already in place are skipped.
+    Log a warning message if some connections failed.
+
+    Maya undo does not revert these connections, see
+    rigIO.channelBox.connect.
+
+    :param snapshot: Snapshot returned by rigIO.channelBox.disconnect.
+    :type snapshot: Iterable of tuple(source plug name, destination plug name)
+
+    :returns: Summary of the made, skipped and failed connections, and the
+        modifiers used to make them, see rigIO.channelBox.connect.
+    :rtype: dict
+
+   :Example:
+        import maya.cmds as mc
+        import rigIO.channelBox
+
+        snapshot = rigIO.channelBox.disconnect(mc.ls(sl=True))
+        rigIO.channelBox.reconnect(snapshot)
+    """
+    summary = {'made': [], 'skipped': [], 'failed': []}
+    connections = []
+
+    for pair in snapshot:
+        pair = tuple(pair)
+        try:
+            mSl = om.MSelectionList()
+            mSl.add(pair[0])
+            mSl.add(pair[1])
+            sourcePlug, destinationPlug = mSl.getPlug(0), mSl.getPlug(1)
+        except (RuntimeError, ValueError) as error:
+            summary['failed'].append(pair+(str(error),))
+            continue
+
+        if destinationPlug.isDestination and \
+                destinationPlug.source() == sourcePlug:
+            summary['skipped'].append(pair+('connected',))
+            continue
+        connections.append((sourcePlug, destinationPlug, pair))
+
+    summary['modifiers'] = _makeConnections(connections, summary)
+
+    if summary['failed']:
+        pm.warning('%d connection(s) failed : %s' % (
+            len(summary['failed']),
+            ', '.join('%s -> %s' % pair[:2] for pair in summary['failed'])))
+
+    return summary
+
+@bulkOperation
+def setLocked(nodes, value, ignores=tuple(), keyable=None, channelBox=None):
+    """Set the lock state of the node(s) channelBox attribute(s).
+
+    The current lock, keyable and channelBox states of all the plugs are read
+    in one pass, then only the plugs differing from the wanted states are
+    changed, with one setAttr per plug in a single bulk operation.
 
     :param nodes:
         OR Maya node(s) name.
         OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
     :type nodes:
         OR iterable of basestring
         OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
 
     :param value:
         True  - Lock the channelBox attribute(s).
         False - Unlock the channelBox attribute(s).
-    :type value: bool
+        None  - Keep the lock state of the channelBox attribute(s).
+    :type value: bool or None
 
     :param ignores: Attribute(s) name to ignore during the process,
         defaults to tuple()
     :type ignores: Iterable of basestring, optional
 
+    :param keyable: If not None, also set the keyable state of the
+        attribute(s), defaults to None
+    :type keyable: bool, optional
+
+    :param channelBox: If not None, also set the channelBox (non keyable but
+        displayed) state of the attribute(s), defaults to None
+    :type channelBox: bool, optional
+
+    :returns: Name of the changed plug(s).
+    :rtype: list of str
+
    :Example:
         import maya.cmds as mc
         import rigIO.channelBox
 
         rigIO.channelBox.setLocked(mc.ls(sl=True), True, ['v'])
-    """
-    for node in nodes:
-        channelBox = ChannelBox(node, *ignores)
-        channelBox.setLocked(value)
 
-def clearKeys(nodes, ignores=tuple()):
+        # Lock and hide.
+        rigIO.channelBox.setLocked(mc.ls(sl=True), True, keyable=False,
+                                   channelBox=False)
+    """
+    changes = []
+    for name, longName, plug in _channelBoxPlugs(nodes, ignores):
+        flags = {}
+        if value is not None and plug.isLocked != bool(value):
+            flags['lock'] = bool(value)
+        if keyable is not None and plug.isKeyable != bool(keyable):
+            flags['keyable'] = bool(keyable)
+        if channelBox is not None and plug.isChannelBox != bool(channelBox):
+            flags['channelBox'] = bool(channelBox)
+
+        if flags:
+            changes.append((name+'.'+longName, flags))
+
+    for plugName, flags in changes:
+        mc.setAttr(plugName, **flags)
+
+    return [plugName for plugName, _ in changes]
+
+@bulkOperation
+def clearKeys(nodes, ignores=tuple(), timeRange=None):
     """Delete the animation key(s) on the node chennelBox attribute(s).
 
+    The connected plug(s) of all the nodes are gathered first, then their
+    keys are deleted with a single cutKey call.
+
     :param nodes:
         OR Maya node(s) name.
         OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
     :type nodes:
         OR iterable of basestring
         OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
 
     :param ignores: Attribute(s) name to ignore during the process,
         defaults to tuple()
     :type ignores: Iterable of basestring, optional
 
+    :param timeRange: (start, end) time range of the keys to delete,
+        defaults to None for all the keys.
+    :type timeRange: tuple(float, float), optional
+
+    :returns: Number of removed animation curves and keys.
+        {'curves': int, 'keys': int}
+    :rtype: dict
+
    :Example:
         import maya.cmds as mc
         import rigIO.channelBox
 
         rigIO.channelBox.clearKeys(mc.ls(sl=True), ['v'])
+        rigIO.channelBox.clearKeys(mc.ls(sl=True), timeRange=(1, 24))
+    """
+    # Only the connected plugs can be animated.
+    plugs = [name+'.'+longName
+             for name, longName, plug in _channelBoxPlugs(nodes, ignores)
+             if plug.isDestination]
+
+    result = {'curves': 0, 'keys': 0}
+    if not plugs:
+        return result
+
+    kwargs = {} if timeRange is None else {'time': tuple(timeRange)}
+    curves = mc.keyframe(plugs, query=True, name=True) or []
+    if not curves:
+        return result
+
+    result['keys'] = mc.keyframe(
+        plugs, query=True, keyframeCount=True, **kwargs) or 0
+    mc.cutKey(plugs, clear=True, **kwargs)
+    result['curves'] = len([curve for curve in set(curves)
+                            if not mc.objExists(curve)])
+
+    return result
+
+def snapshot(nodes, ignores=tuple()):
+    """Store the value of the node(s) channelBox attribute(s) in one pass.
+
+    :param nodes:
+        OR Maya node(s) name.
+        OR PyNode instance(s) of Maya node(s).
+        OR ChannelBox instance(s), their own ignores are also applied.
+    :type nodes:
+        OR iterable of basestring
+        OR iterable of pymel.core.PyNode
+        OR iterable of ChannelBox
+
+    :param ignores: Attribute(s) name to ignore during the process,
+        defaults to tuple()
+    :type ignores: Iterable of basestring, optional
+
+    :returns: Stored pose.
+    :rtype: Pose
+
+   :Example:
+        import maya.cmds as mc
+        import rigIO.channelBox
+
+        pose = rigIO.channelBox.snapshot(mc.ls(sl=True), ['v'])
+        pose.save('/tmp/pose.rpose')
+        # ...
+        rigIO.channelBox.restore(rigIO.channelBox.Pose.load('/tmp/pose.rpose'))
+    """
+    names = []
+    values = array.array('d')
+
+    for name, longName, plug in _channelBoxPlugs(nodes, ignores):
+        if plug.isCompound or plug.isArray:
+            continue
+        names.append(name+'.'+longName)
+        values.append(plug.asDouble())
+
+    return Pose(names, values)
+
+# Numeric types set as integer.
+_INT_NUMERIC_TYPES = frozenset((
+    om.MFnNumericData.kByte,
+    om.MFnNumericData.kChar,
+    om.MFnNumericData.kShort,
+    om.MFnNumericData.kInt,
+    om.MFnNumericData.kLong,
+))
+
+def _setPlugValue(modifier, plug, value):
+    """Queue the given internal value on the given plug.
+
+    :param modifier: Modifier to queue the value on.
+    :type modifier: om.MDGModifier
+
+    :param plug: Api plug.
+    :type plug: om.MPlug
+
+    :param value: Value in internal units.
+    :type value: float
     """
-    for node in nodes:
-        channelBox = ChannelBox(node, *ignores)
-        channelBox.clearKeys()
+    attr = plug.attribute()
+    if attr.hasFn(om.MFn.kEnumAttribute):
+        modifier.newPlugValueInt(plug, int(round(value)))
+    elif attr.hasFn(om.MFn.kNumericAttribute):
+        numericType = om.MFnNumericAttribute(attr).numericType()
+        if numericType == om.MFnNumericData.kBoolean:
+            modifier.newPlugValueBool(plug, bool(value))
+        elif numericType in _INT_NUMERIC_TYPES:
+            modifier.newPlugValueInt(plug, int(round(value)))
+        else:
+            modifier.newPlugValueDouble(plug, value)
+    else:
+        modifier.newPlugValueDouble(plug, value)
+
+@bulkOperation(undoChunk=False)
+def restore(pose):
+    """Restore the given pose through a single MDGModifier.
+    The keyed attribute(s) are set as well, as pymel set does. The locked,
+    driven and missing attribute(s) are skipped and logged in a single
+    warning message.
+
+    Maya undo does not revert the restore, call undoIt() on the returned
+    modifier instead.
+
+    :param pose: Pose to restore.
+    :type pose: Pose
+
+    :returns: Modifier used to restore the pose, its undoIt() method reverts
+        the restore.
+    :rtype: om.MDGModifier
+
+   :Example:
+        import maya.cmds as mc
+        import rigIO.channelBox
+
+        pose = rigIO.channelBox.snapshot(mc.ls(sl=True))
+        rigIO.channelBox.restore(pose)
+    """
+    mSl = om.MSelectionList()
+    indices = []
+    skipped = []
+
+    for position, name in enumerate(pose.names):
+        length = mSl.length()
+        try:
+            mSl.add(name)
+        except RuntimeError:
+            skipped.append(name)
+            continue
+        if mSl.length() == length + 1:
+            indices.append((length, position))
+        else:
+            skipped.append(name)
+
+    modifier = om.MDGModifier()
+    values = pose.values
+    for index, position in indices:
+        plug = mSl.getPlug(index)
+        if plug.isLocked or _isDriven(plug):
+            skipped.append(pose.names[position])
+            continue
+        _setPlugValue(modifier, plug, float(values[position]))
+
+    modifier.doIt()
+
+    if skipped:
+        pm.warning('Unable to restore : %s' % ', '.join(skipped))
+
+    return modifier
 
 # Class #############################################################################
 
-class ChannelBox(tuple):
+class ChannelBox(object):
     """
     Class to manage a node channelBox attributes.
     """
-    def __new__(cls, node, *ignores):
-        """__new__(node, *ignores) method of builtins.type instance
-        Create and return a new object.
+    __slots__ = (
+        'node', '_ignores', '_ignoreSet', '_attrs', '_names', '_index')
+
+    # Channel box attribute names and name index shared by the nodes having
+    # the same type and the same keyable / channelBox attributes.
+    # {(nodeType, keyables, channelBoxes): (names, index)}
+    _attributeCache = {}
+
+    def __init__(self, node, *ignores):
+        """x.__init__(node, *ignores) <==> x(node, *ignores)
 
         :param node:
             OR Maya node name.
@@ -159,15 +929,70 @@ class ChannelBox(tuple):
         :param *ignores: Attribute(s) name to ignore during the process.
         :type *ignores: str
         """
-        cls.node = pm.PyNode(node) if isinstance(node, basestring) else node
-        cls._ignores = ignores
+        self.node = pm.PyNode(node) if isinstance(node, basestring) else node
+        self.ignores = ignores
+        self._names, self._index = self._attributeNames(self.node.name())
+        self._attrs = tuple(self.node.attr(name) for name, _ in self._names)
+
+    @classmethod
+    def _attributeNames(cls, name):
+        """Gets the keyable or in channelBox attribute names of the given node.
+
+        The names are computed once per node type and keyable / channelBox
+        signature, then shared by every node matching this signature. As the
+        signature comes from the node itself, adding or removing an attribute
+        gives the node a new signature.
+
+        :param name: Maya node name.
+        :type name: str
+
+        :returns: (long name, short name) of the attributes in the node
+            listAttr order, and the index of each long and short name.
+        :rtype: tuple(tuple of tuple(str, str), dict{str:int})
+        """
+        keyables = tuple(mc.listAttr(name, keyable=True) or ())
+        channelBoxes = tuple(mc.listAttr(name, channelBox=True) or ())
+        key = (mc.nodeType(name), keyables, channelBoxes)
+
+        cached = cls._attributeCache.get(key)
+        if cached is None:
+            if channelBoxes:
+                order = dict((attr, index) for index, attr in
+                             enumerate(mc.listAttr(name) or ()))
+                longNames = sorted(set(keyables + channelBoxes),
+                                   key=lambda attr: order.get(attr, len(order)))
+            else:
+                longNames = keyables
+
+            names = tuple(
+                (longName, mc.attributeName(name+'.'+longName, short=True))
+                for longName in longNames)
+            # The first attribute wins when a name is used twice.
+            index = {}
+            for position in reversed(range(len(names))):
+                longName, shortName = names[position]
+                index[shortName] = position
+                index[longName] = position
 
-        content = tuple()
-        for attr in cls.node.listAttr():
-            if attr.isKeyable() or attr.isInChannelBox():
-                content += attr,
+            cached = cls._attributeCache[key] = (names, index)
 
-        return tuple.__new__(cls, content)
+        return cached
+
+    @classmethod
+    def clearCache(cls):
+        """Clear the attribute names shared between the ChannelBox instances.
+        """
+        cls._attributeCache.clear()
+
+    def __len__(self):
+        """len(x) <-> x.__len__()
+        """
+        return len(self._attrs)
+
+    def __iter__(self):
+        """iter(x) <-> x.__iter__()
+        """
+        return iter(self._attrs)
 
     def __repr__(self):
         """repr(x) <-> x.__repr__()
@@ -179,35 +1004,35 @@ class ChannelBox(tuple):
 
         :param index:
             OR Index number of the wanted attribute.
+            OR Slice of the wanted attributes.
             OR Name of the wanted attribute.
             OR Pymel attribute.
         :type index:
             OR int
+            OR slice
             OR basestring
             OR pymel.core.PyNode
 
-        :returns: Attribute at the given index.
-        :rtype: pymel.core.PyNode
+        :returns: Attribute at the given index, or tuple of the attributes of
+            the given slice.
+        :rtype: pymel.core.PyNode or tuple
 
         :raises: KeyError, TypeError
         """
         if isinstance(index, int):
-            return super(ChannelBox, self).__getitem__(index)
+            return self._attrs[index]
 
-        elif isinstance(index, pm.general.Attribute):
-            for attr in self:
-                if index.shortName() == attr.shortName():
-                    return attr
-            raise KeyError(index)
+        elif isinstance(index, slice):
+            return tuple(self._attrs[index])
 
-        elif isinstance(index, basestring):
-            for attr in self:
-                if index in (attr.longName(), attr.shortName()):
-                    return attr
-            raise KeyError(index)
+        elif isinstance(index, (pm.general.Attribute, basestring)):
+            position = self._position(index)
+            if position is None:
+                raise KeyError(index)
+            return self._attrs[position]
 
         else:
-            errorMessage = '%s indices must be integers ' % self.__class__.__name__
+            errorMessage = '%s indices must be integers, slices, ' % self.__class__.__name__
             errorMessage += 'string or pymel.core.general.Attribute. '
             errorMessage += 'Gets %s' % type(index)
             raise TypeError(errorMessage)
@@ -215,13 +1040,42 @@ class ChannelBox(tuple):
     def __contains__(self, key):
         """y in x <-> x.__contains__(y)
         """
-        if not isinstance(key, pm.general.Attribute):
-            return super(ChannelBox, self).__contains__(key)
-        else:
-            for attr in self:
-                if key.longName() == attr.longName():
-                    return True
-        return False
+        if isinstance(key, (pm.general.Attribute, basestring)):
+            return self._position(key) is not None
+        return key in self._attrs
+
+    def _position(self, key):
+        """Gets the position of the given attribute from the name index.
+
+        :param key:
+            OR Name of the wanted attribute.
+            OR Pymel attribute.
+        :type key:
+            OR basestring
+            OR pymel.core.PyNode
+
+        :returns: Position of the attribute or None.
+        :rtype: int or None
+        """
+        if isinstance(key, basestring):
+            return self._index.get(key)
+
+        position = self._index.get(key.longName())
+        if position is None:
+            position = self._index.get(key.shortName())
+        return position
+
+    def _filterIndices(self):
+        """Gets the position of the node channelBox attribute(s) after the
+        ignores filter.
+
+        :returns: Attribute positions.
+        :rtype: generator of int
+        """
+        ignores = self._ignoreSet
+        for position, (longName, shortName) in enumerate(self._names):
+            if not (longName in ignores or shortName in ignores):
+                yield position
 
     def _filter(self):
         """Gets the node channelBox attribute(s) after the ignores filter.
@@ -229,12 +1083,8 @@ class ChannelBox(tuple):
         :returns: Pymel attributes.
         :rtype: generator of pymel.core.PyNode
         """
-        for attr in self:
-            short_name_in_ignores = attr.shortName() in self.ignores
-            long_name_in_ignores = attr.longName() in self.ignores
-
-            if not (short_name_in_ignores or long_name_in_ignores):
-                yield attr
+        for position in self._filterIndices():
+            yield self._attrs[position]
 
     @property
     def ignores(self):
@@ -261,6 +1111,7 @@ class ChannelBox(tuple):
         if value is None:
             value = tuple()
         self._ignores = value
+        self._ignoreSet = frozenset(value)
 
     def get(self, key, default=None):
         """x.get(key, default) -> x[key] if key in x, else default.
@@ -290,11 +1141,24 @@ class ChannelBox(tuple):
             channelBox = ChannelBox('nodeName')
             channelBox.get('attributeName')
         """
-        return self[key] if key in self else default
+        if isinstance(key, int):
+            return self._attrs[key] if -len(self) <= key < len(self) else default
+
+        position = self._position(key)
+        return default if position is None else self._attrs[position]
 
-    def setDefault(self):
-        """Set the node channelBox attributes(s) to there default value if there is.
-        Log a warning message if a RuntimeError occur during the set value process.
+    def setDefault(self, returnValues=False):
+        """Set the node channelBox attributes(s) to there default value if there
+        is, see rigIO.channelBox.setDefault.
+        Log a warning message if some values could not be set.
+
+        :param returnValues: If True, return the changed values,
+            defaults to False
+        :type returnValues: bool, optional
+
+        :returns: If returnValues, the (previous, default) value of each
+            changed attribute.
+        :rtype: dict{str:tuple} or None
 
         :Example:
             from rigIO.channelBox import ChannelBox
@@ -302,24 +1166,14 @@ class ChannelBox(tuple):
             channelBox = ChannelBox('nodeName')
             channelBox.setDefault()
         """
-        for attr in self._filter():
-            if attr.attrName() in ('tx', 'ty', 'tz', 'rx', 'ry', 'rz'):
-                defaultValue = 0
-            elif attr.attrName() in ('sx', 'sy', 'sz', 'v'):
-                defaultValue = 1
-            else:
-                defaultValue = pm.addAttr(attr, query=True, defaultValue=True)
-
-            if not (defaultValue is None):
-                try:
-                    attr.set(defaultValue)
-                except RuntimeError as message:
-                    pm.warning(message.message[:-1])
+        values = setDefault([self], returnValues=returnValues)
+        if returnValues:
+            return values.get(_nodeName(self), {})
 
     def connect(self, *destinations):
         """Connect current channelBox attribute(s) to the destination(s)
-        channelBox attribute(s). Log a warning message if a RuntimeError occurs
-        during the connection process.
+        channelBox attribute(s) in one batch, see rigIO.channelBox.connect.
+        Log a warning message if some connections failed.
 
         :param *destinations:
             OR Maya node name of the wanted destination(s).
@@ -348,23 +1202,21 @@ class ChannelBox(tuple):
             destinationChannelBoxA = ChannelBox('destination_a')
             destinationChannelBoxB = ChannelBox('destination_b')
             sourceChannelBox.connect(destinationChannelBoxA, destinationChannelBoxB)
+
+        :returns: Summary of the made, skipped and failed connections, and
+            the modifiers used to make them.
+        :rtype: dict
         """
-        for channelBox in destinations:
+        return connect(self, destinations, self.ignores)
 
-            if not isinstance(channelBox, ChannelBox):
-                channelBox = ChannelBox(channelBox)
+    def disconnect(self):
+        """Disconnect the incoming connection(s) of the node channelBox
+        attribute(s) in one batch, see rigIO.channelBox.disconnect.
 
-            for attr in channelBox._filter():
-                sourceAttr = self.get(attr)
-                if sourceAttr:
-                    try:
-                        sourceAttr >> attr
-                    except RuntimeError as error:
-                        pm.warning(error.message[:-1])
+        :returns: Snapshot of the broken connections.
+        :rtype: tuple of tuple(source plug name, destination plug name)
 
-    def disconnect(self):
-        """Disconnect the node channelBox attribute(s).
-        Log a warning error if there is no incoming connection(s).
+        :raises: DisconnectError
 
         :Example:
             from rigIO.channelBox import ChannelBox
@@ -372,23 +1224,28 @@ class ChannelBox(tuple):
             channelBox = ChannelBox('nodeName')
             channelBox.disconnect()
         """
-        for attr in self._filter():
-            sourceAttr = attr.listConnections(source=True, plugs=True)
-            sourceAttr = (sourceAttr or [None])[0]
-
-            if sourceAttr and sourceAttr.isSource():
-                sourceAttr // attr
-            else:
-                message = '%s has no incoming connections.' % attr.name()
-                pm.warning(message)
+        return disconnect([self])
 
-    def setLocked(self, value):
-        """Set the lock state of the node channelBox attribute(s).
+    def setLocked(self, value, keyable=None, channelBox=None):
+        """Set the lock state of the node channelBox attribute(s), see
+        rigIO.channelBox.setLocked.
 
         :param value:
             True  - Lock the channelBox attribute(s).
             False - Unlock the channelBox attribute(s).
-        :type value: bool
+            None  - Keep the lock state of the channelBox attribute(s).
+        :type value: bool or None
+
+        :param keyable: If not None, also set the keyable state of the
+            attribute(s), defaults to None
+        :type keyable: bool, optional
+
+        :param channelBox: If not None, also set the channelBox state of the
+            attribute(s), defaults to None
+        :type channelBox: bool, optional
+
+        :returns: Name of the changed plug(s).
+        :rtype: list of str
 
         :Example:
             from rigIO.channelBox import ChannelBox
@@ -397,11 +1254,18 @@ class ChannelBox(tuple):
             channelBox.setLocked(True)
             channelBox.setLocked(False)
         """
-        for attr in self._filter():
-            attr.setLocked(value)
+        return setLocked([self], value, keyable=keyable, channelBox=channelBox)
+
+    def clearKeys(self, timeRange=None):
+        """Delete the animation key(s) on the node chennelBox attribute(s),
+        see rigIO.channelBox.clearKeys.
 
-    def clearKeys(self):
-        """Delete the animation key(s) on the node chennelBox attribute(s).
+        :param timeRange: (start, end) time range of the keys to delete,
+            defaults to None for all the keys.
+        :type timeRange: tuple(float, float), optional
+
+        :returns: Number of removed animation curves and keys.
+        :rtype: dict
 
         :Example:
             from rigIO.channelBox import ChannelBox
@@ -409,5 +1273,128 @@ class ChannelBox(tuple):
             channelBox = ChannelBox('nodeName')
             channelBox.clearKeys()
         """
-        for attr in self._filter():
-            pm.cutKey(attr)
+        return clearKeys([self], timeRange=timeRange)
+
+    def snapshot(self):
+        """Store the value of the node channelBox attribute(s), see
+        rigIO.channelBox.snapshot.
+
+        :returns: Stored pose.
+        :rtype: Pose
+
+        :Example:
+            from rigIO.channelBox import ChannelBox
+
+            channelBox = ChannelBox('nodeName')
+            pose = channelBox.snapshot()
+        """
+        return snapshot([self])
+
+
+class Pose(object):
+    """
+    Values of channelBox attributes, stored as a float64 buffer along a plug
+    name table. The values are in internal units (centimeters, radians).
+    """
+    __slots__ = ('names', 'values')
+
+    # File layout : header, utf-8 '\n' joined names, padding to 8 bytes,
+    # float64 little endian values.
+    _MAGIC = b'RIGIOPSE'
+    _HEADER = struct.Struct('<8sII')
+
+    def __init__(self, names, values):
+        """x.__init__(names, values) <==> x(names, values)
+
+        :param names: Plug name of each value.
+        :type names: Iterable of str
+
+        :param values: Float64 buffer of the values.
+        :type values: array.array or numpy.ndarray
+        """
+        self.names = tuple(names)
+        self.values = values
+
+    def __len__(self):
+        """len(x) <-> x.__len__()
+        """
+        return len(self.names)
+
+    def __iter__(self):
+        """iter(x) <-> x.__iter__()
+        Iterate over the (plug name, value) pairs.
+        """
+        return iter(zip(self.names, self.values))
+
+    def __repr__(self):
+        """repr(x) <-> x.__repr__()
+        """
+        return '%s(%d plugs)' % (self.__class__.__name__, len(self))
+
+    def restore(self):
+        """Restore the pose, see rigIO.channelBox.restore.
+
+        :rtype: om.MDGModifier
+        """
+        return restore(self)
+
+    def save(self, path):
+        """Write the pose in the given binary file.
+
+        :param path: File path.
+        :type path: str
+        """
+        names = u'\n'.join(self.names).encode('utf-8')
+        header = self._HEADER.pack(self._MAGIC, len(self.names), len(names))
+        padding = -(len(header) + len(names)) % 8
+
+        values = self.values
+        if not isinstance(values, array.array):
+            values = array.array('d', values)
+        if struct.pack('=d', 1.0) != struct.pack('<d', 1.0):
+            values = array.array('d', values)
+            values.byteswap()
+
+        with open(path, 'wb') as stream:
+            stream.write(header)
+            stream.write(names)
+            stream.write(b'\0' * padding)
+            values.tofile(stream)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Read a pose from the given binary file.
+
+        :param path: File path.
+        :type path: str
+
+        :param mmap: If True and numpy is available, memory-map the values
+            instead of reading them, defaults to True
+        :type mmap: bool, optional
+
+        :rtype: Pose
+
+        :raises: ValueError
+        """
+        with open(path, 'rb') as stream:
+            magic, count, size = cls._HEADER.unpack(
+                stream.read(cls._HEADER.size))
+            if magic != cls._MAGIC:
+                raise ValueError('%s is not a rigIO pose file.' % path)
+
+            names = stream.read(size).decode('utf-8')
+            names = names.split(u'\n') if count else []
+            offset = cls._HEADER.size + size
+            offset += -offset % 8
+
+            if mmap and count and np is not None:
+                values = np.memmap(path, dtype='<f8', mode='r',
+                                   offset=offset, shape=(count,))
+            else:
+                stream.seek(offset)
+                values = array.array('d')
+                values.fromfile(stream, count)
+                if struct.pack('=d', 1.0) != struct.pack('<d', 1.0):
+                    values.byteswap()
+
+        return cls(names, values)
@@ -1,8 +1,12 @@
-import maya.cmds as mc
+try:
+    import maya.cmds as mc
+except ImportError:
+    # Outside of Maya, only the naming constants are meaningful.
+    mc = None
 
 #_Format_____________________________________________________________________________
 FORMAT  = '{side}_{info}_{type}_{num}'
-TAGS    = tuple(i_SHORT for i in FORMAT._formatter_parser())
+TAGS    = tuple(i[1] for i in FORMAT._formatter_parser() if i[1])
 TAG_NUM = len(TAGS)
 
 #_Sides______________________________________________________________________________
@@ -22,7 +26,7 @@ SIDES = {
 }
 
 #_Default_Nodes______________________________________________________________________
-DEFAULTS = tuple(mc.ls(defaultNodes=True))
+DEFAULTS = tuple(mc.ls(defaultNodes=True) or []) if mc else tuple()
 
 
 #_Other_Types________________________________________________________________________
@@ -284,22 +288,22 @@ ENV_SPHERE_SHORT = 'eSph'
 
 #_lights_Types_______________________________________________________________________
 EMBIENT_LIGHT = 'ambientLight'
-EMBIENT_LIGHT_SHORT 'ambl'
+EMBIENT_LIGHT_SHORT = 'ambl'
 
 AREA_LIGHT = 'areaLight'
-AREA_LIGHT_SHORT 'arl'
+AREA_LIGHT_SHORT = 'arl'
 
 DIRECTIONAL_LIGHT = 'directionalLight'
-DIRECTIONAL_LIGHT_SHORT 'dirl'
+DIRECTIONAL_LIGHT_SHORT = 'dirl'
 
 POINT_LIGHT = 'pointLight'
-POINT_LIGHT_SHORT 'pl'
+POINT_LIGHT_SHORT = 'pl'
 
 SPOT_LIGHT = 'spotLight'
-SPOT_LIGHT_SHORT 'sl'
+SPOT_LIGHT_SHORT = 'sl'
 
 VOLUME_LIGHT = 'volumeLight'
-VOLUME_LIGHT_SHORT 'vl'
+VOLUME_LIGHT_SHORT = 'vl'
 
 #_Utilities_Types____________________________________________________________________
 ADD_DOUBLE_LINEAR = 'addDoubleLinear'
@@ -729,5 +733,5 @@ TYPES = {
     XGM_SE_EXPR : XGM_SE_EXPR_SHORT,
 }
 
-TYPES_SHORT = /
+TYPES_SHORT = \
     dict( (shortName, longName) for longName, shortName in TYPES.iteritems() )
@@ -0,0 +1,199 @@
+# Maya libraries
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+# RigIO libraries
+from constants import TAGS, SIDES, LEFT, RIGHT, CENTER
+
+__all__ = [
+    'mirrorName',
+    'MirrorIndex',
+    'getMirrorIndex',
+]
+
+# Side tag to its mirrored side tag, the center tags mirror to themselves.
+_SIDE_SWAPS = {
+    LEFT: RIGHT,
+    RIGHT: LEFT,
+    SIDES[LEFT]: SIDES[RIGHT],
+    SIDES[RIGHT]: SIDES[LEFT],
+    CENTER: CENTER,
+    SIDES[CENTER]: SIDES[CENTER],
+}
+
+_SIDE_INDEX = TAGS.index('side')
+
+
+def mirrorName(name):
+    """Return the mirrored name of the given node name.
+
+    The side tag is looked for at its FORMAT position first, then in any other
+    token of the name. The namespace and the dag path are kept as is.
+
+    :param name: Node name.
+    :type name: str
+
+    :returns: Mirrored name, the name itself for a center node, or None if the
+        name has no side tag.
+    :rtype: str or None
+    """
+    path, _, leaf = name.rpartition('|')
+    namespace, _, niceName = leaf.rpartition(':')
+    tokens = niceName.split('_')
+
+    positions = range(len(tokens))
+    if _SIDE_INDEX < len(tokens):
+        positions = [_SIDE_INDEX] + \
+            [i for i in range(len(tokens)) if i != _SIDE_INDEX]
+
+    for position in positions:
+        side = _SIDE_SWAPS.get(tokens[position])
+        if side is not None:
+            tokens[position] = side
+            break
+    else:
+        return None
+
+    leaf = '_'.join(tokens)
+    if namespace:
+        leaf = namespace+':'+leaf
+    return path+'|'+leaf if path else leaf
+
+
+class MirrorIndex(object):
+    """Scene index of each node name to the name of its mirrored node.
+
+    The index is keyed on the node names with their namespace, without the
+    dag path, so reparenting doesn't invalidate it. It is built once per
+    scene, then kept up to date by the node added, node removed, name changed
+    and scene callbacks.
+
+    :Example:
+        from rigIO.mirror import getMirrorIndex
+
+        index = getMirrorIndex()
+        index.get('l_arm_ctrl_1')  # 'r_arm_ctrl_1'
+    """
+
+    def __init__(self):
+        self._names = {}
+        self._counterparts = {}
+        self._built = False
+        self._callbackIds = []
+
+    def __len__(self):
+        """len(x) <==> x.__len__()"""
+        self._build()
+        return len(self._counterparts)
+
+    def __contains__(self, name):
+        """y in x <==> x.__contains__(y)"""
+        self._build()
+        return name.split('|')[-1] in self._counterparts
+
+    def get(self, name, default=None):
+        """Return the mirrored node name of the given node.
+
+        :param name: Node name, with or without dag path.
+        :type name: str
+
+        :param default: Object to return if the node has no mirrored node.
+        :type default: optional
+
+        :returns: Mirrored node name, with its namespace.
+        :rtype: str
+        """
+        self._build()
+        return self._counterparts.get(name.split('|')[-1], default)
+
+    def _add(self, name):
+        self._names[name] = self._names.get(name, 0) + 1
+
+        mirrored = mirrorName(name)
+        if mirrored == name:
+            self._counterparts[name] = name
+        elif mirrored in self._names:
+            self._counterparts[name] = mirrored
+            self._counterparts[mirrored] = name
+
+    def _remove(self, name):
+        count = self._names.get(name, 0) - 1
+        if count > 0:
+            self._names[name] = count
+            return
+
+        self._names.pop(name, None)
+        mirrored = self._counterparts.pop(name, None)
+        if mirrored is not None and mirrored != name:
+            self._counterparts.pop(mirrored, None)
+
+    def _build(self):
+        if self._built:
+            return
+
+        self._names.clear()
+        self._counterparts.clear()
+        for name in mc.ls(long=True) or []:
+            self._add(name.split('|')[-1])
+
+        self._built = True
+        self.install()
+
+    def invalidate(self):
+        """Rebuild the index on its next access."""
+        self._built = False
+
+    def _onNodeAdded(self, mObject, *args):
+        if self._built:
+            self._add(om.MFnDependencyNode(mObject).name())
+
+    def _onNodeRemoved(self, mObject, *args):
+        if self._built:
+            self._remove(om.MFnDependencyNode(mObject).name())
+
+    def _onNameChanged(self, mObject, prevName, *args):
+        if not self._built:
+            return
+        if prevName in self._names:
+            self._remove(prevName)
+        self._add(om.MFnDependencyNode(mObject).name())
+
+    def _onSceneChanged(self, *args):
+        # Invalidated before the new or opened scene loads, so its nodes are
+        # not indexed one by one by _onNodeAdded.
+        self.invalidate()
+
+    def install(self):
+        """Register the Maya callbacks keeping the index up to date."""
+        if self._callbackIds:
+            return
+
+        self._callbackIds = [
+            om.MDGMessage.addNodeAddedCallback(self._onNodeAdded),
+            om.MDGMessage.addNodeRemovedCallback(self._onNodeRemoved),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._onNameChanged),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeNew, self._onSceneChanged),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeOpen, self._onSceneChanged),
+        ]
+
+    def uninstall(self):
+        """Remove the Maya callbacks, the index is rebuilt on its next access.
+        """
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+        self.invalidate()
+
+
+_MIRROR_INDEX = MirrorIndex()
+
+
+def getMirrorIndex():
+    """Return the scene mirror index shared by the rigIO tools.
+
+    :rtype: MirrorIndex
+    """
+    return _MIRROR_INDEX
@@ -1,35 +1,189 @@
 # Python libraries
 import os
-import re
 import json
+from collections import OrderedDict, namedtuple
 # Maya libraries
 import maya.cmds as mc
+import maya.api.OpenMaya as om
 # RigIO libraries
-from constants import FORMAT, TAGS, TAG_NUM, SIDES, EXCEPTIONS, TYPES
+from constants import TAGS, TAG_NUM, SIDES, TYPES
+from nameUtils import FORMAT_REGEX, validateNames, splitCamelCases, \
+    joinCamelCases, _TAG_CHECKS
+from openMayaUtils import getMObject
 
 __all__ = [
     'AbstractNameConvention',
     'NameConvention',
+    'parseName',
+    'validateNames',
+    'splitCamelCases',
+    'joinCamelCases',
+    'typeSuffix',
+    'getTypeSuffixes',
 ]
 
+
+# Immutable result of parseName.
+ParsedName = namedtuple('ParsedName', ('name', 'niceName', 'split') + TAGS)
+
+# Parse results of the last parsed names, see parseName.
+_PARSE_CACHE = OrderedDict()
+_PARSE_CACHE_SIZE = 10000
+
+
+def parseName(name):
+    """Parse the given node name against the FORMAT regex.
+
+    The results are memoised, a repeated name returns the same ParsedName.
+
+    :param name: Node name, with or without namespace and dag path.
+    :type name: str
+
+    :returns: Parsed name, its tag fields are None if the name doesn't match
+        the FORMAT.
+    :rtype: ParsedName
+    """
+    parsed = _PARSE_CACHE.get(name)
+    if parsed is not None:
+        # Move the name to the most recently used end.
+        del _PARSE_CACHE[name]
+        _PARSE_CACHE[name] = parsed
+        return parsed
+
+    niceName = name.split(':')[-1].split('|')[-1]
+    match = FORMAT_REGEX.match(niceName)
+    tags = match.groupdict() if match else {}
+
+    parsed = ParsedName(
+        name=name,
+        niceName=niceName,
+        split=tuple(niceName.split('_')),
+        **dict((tag, tags.get(tag)) for tag in TAGS))
+
+    _PARSE_CACHE[name] = parsed
+    if len(_PARSE_CACHE) > _PARSE_CACHE_SIZE:
+        _PARSE_CACHE.popitem(last=False)
+
+    return parsed
+
+
+# Suffix of each node type name and MFn api type, see _buildSuffixTable.
+# A None value is an already resolved type without suffix.
+_SUFFIXES = {}
+
+
+def _buildSuffixTable():
+    """Build once per session the suffix table of the TYPES, indexed by their
+    node type name and, when the MFn constant of the same name exists, by
+    their api type.
+
+    :returns: Dictionary of node type name or api type to suffix.
+    :rtype: dict{str or int:str}
+    """
+    if _SUFFIXES:
+        return _SUFFIXES
+
+    _SUFFIXES.update(TYPES)
+    for typeName, suffix in TYPES.items():
+        apiType = getattr(om.MFn, 'k'+typeName[:1].upper()+typeName[1:], None)
+        if isinstance(apiType, int):
+            _SUFFIXES[apiType] = suffix
+
+    return _SUFFIXES
+
+
+def typeSuffix(nodeType, default=None):
+    """Return the suffix of the given node type.
+
+    A node type name missing from the TYPES falls back on the suffix of its
+    closest inherited type, like a custom locator on the locator suffix. The
+    result is cached per node type.
+
+    :param nodeType: Node type name or MFn api type.
+    :type nodeType: str or int
+
+    :param default: Suffix returned if the type has no suffix.
+    :type default: str, optional
+
+    :rtype: str
+    """
+    table = _buildSuffixTable()
+    if nodeType in table:
+        suffix = table[nodeType]
+        return default if suffix is None else suffix
+
+    suffix = None
+    if isinstance(nodeType, basestring):
+        inherited = mc.nodeType(nodeType, inherited=True, isTypeName=True)
+        for typeName in reversed(inherited or []):
+            suffix = table.get(typeName)
+            if suffix is not None:
+                break
+
+    table[nodeType] = suffix
+    return default if suffix is None else suffix
+
+
+def getTypeSuffixes(nodes, default=None):
+    """Return the suffix of the node type of each given node.
+
+    The nodes are resolved in one batch and the suffixes looked up by api
+    type first, then by node type name, so no node type is queried per node.
+
+    :param nodes: Node(s) name.
+    :type nodes: str or list
+
+    :param default: Suffix of the nodes whose type has no suffix.
+    :type default: str, optional
+
+    :returns: Suffix(es) of the given node(s)
+        The return type depends on the nodes parameter type.
+    :rtype: str or list
+    """
+    isList = not isinstance(nodes, basestring)
+    mObjects = getMObject(nodes if isList else [nodes])
+
+    table = _buildSuffixTable()
+    fnNode = om.MFnDependencyNode()
+    suffixes = []
+    for mObject in mObjects:
+        suffix = table.get(mObject.apiType())
+        if suffix is None:
+            fnNode.setObject(mObject)
+            suffix = typeSuffix(fnNode.typeName, default)
+        suffixes.append(suffix)
+
+    return suffixes if isList else suffixes[0]
+
+
 class AbstractNameConvention(object):
+    __slots__ = ('_parsed',)
 
     def __init__(self, name):
         super(AbstractNameConvention, self).__init__()
         self.name = name
 
 
+    @property
+    def name(self):
+        return self._parsed.name
+
+
+    @name.setter
+    def name(self, value):
+        self._parsed = parseName(value)
+
+
     @property
     def niceName(self):
-        niceName = self.name.split(':')[-1]
-        return niceName.split('|')[-1]
+        return self._parsed.niceName
 
 
     @property
     def split(self):
         """ x.split <==> x.niceName.split('_')
         """
-        return self.niceName.split('_')
+        return list(self._parsed.split)
 
 
     @property
@@ -38,7 +192,7 @@ class AbstractNameConvention(object):
 
         :rtype: {bool}
         """
-        return len(self.split) == TAG_NUM
+        return len(self._parsed.split) == TAG_NUM
 
 
     @property
@@ -51,21 +205,21 @@ class AbstractNameConvention(object):
         if not self.isFormat:
             return {}
 
-        rtn = {}
-        for tag in TAGS:
-            rtn[tag] = self.__getattribute__(tag)
-
-        return rtn
+        return dict((tag, getattr(self, tag)) for tag in TAGS)
 
 
     @property
     def isValid(self):
-        """Check if the given name is valid.
+        """Check if the given name is valid, with the tag checks of
+        validateNames.
         :rtype: {bool}
         """
+        if not self.isFormat:
+            return False
 
         for tag in TAGS:
-            if not self.__getattribute__(tag):
+            value = getattr(self, tag)
+            if not value or not _TAG_CHECKS.get(tag, bool)(value):
                 return False
 
         return True
@@ -81,55 +235,72 @@ class AbstractNameConvention(object):
         :returns: List containing the split string.
         :rtype: {list(str)}
         """
-        return re.findall(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)|[0-9]+', strArg)
+        return list(splitCamelCases((strArg,))[0])
 
 
     @staticmethod
     def joinCamelCase(*strArgs):
-        return strArgs[0]+''.join(
-            [i.replace(i[0], i[0].upper()) for i in strArgs[1:]])
+        """Join the given strings in a camel case string.
+
+        :param strArgs: Strings to join.
+        :type strArgs: str
+
+        :returns: Joined string.
+        :rtype: {str}
+        """
+        return joinCamelCases((strArgs,))[0]
 
 
 class NameConvention(AbstractNameConvention):
+    __slots__ = ('_side', '_info', '_type', '_num')
 
     def __init__(self, name, side=None, info=None, type=None, num=None):
         """x.__init__(name) <==> x(name)
         """
         super(NameConvention, self).__init__(name)
-        _side = side
-        _info = info
-        _type = type
-        _num  = num
+        self._side = side
+        self._info = info
+        self._type = type
+        self._num  = num
 
     @property
     def side(self):
+        if self._side is not None:
+            return self._side
 
         if not self.isFormat:
-            side = self.split[0][0]
+            side = self._parsed.split[0][:1]
         else :
-            side = self.split[TAGS.index('side')]
+            side = self._parsed.side
 
-        if side in __SIDES.values():
+        if side in SIDES.values():
             return side
 
     @property
     def info(self):
+        if self._info is not None:
+            return self._info
 
         if not self.isFormat:
             split = self.splitCamelCase(self.niceName)
             num = ([i for i in split if i.isdigit()] or [None])[-1]
             if num:
                 split.remove(num)
-            info = self.joinCamelCase(*split)
+            return self.joinCamelCase(*split) if split else None
 
-        else:
-            info = self.split[TAGS.index('info')]
+        return self._parsed.info
 
     # Type
+    @property
+    def type(self):
+        return self.getType()
+
     def getType(self):
+        if self._type is not None:
+            return self._type
         if not self.isFormat:
             return 'none'
-        return self.split[TAGS.index('Type')]
+        return self._parsed.type
 
 
     def isValidType(self):
@@ -138,10 +309,16 @@ class NameConvention(AbstractNameConvention):
         pass
 
     # Num
+    @property
+    def num(self):
+        return self.getNum()
+
     def getNum(self):
+        if self._num is not None:
+            return self._num
         if not self.isFormat:
             return '1'
-        return self.split[TAGS.index('Num')]
+        return self._parsed.num
 
 
     def isValidNum(self):
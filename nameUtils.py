@@ -0,0 +1,158 @@
+"""Naming helpers without any Maya dependency, usable outside of Maya on
+names coming from files, pipelines or mc.ls() dumps.
+"""
+# Python libraries
+import re
+import string
+# RigIO libraries
+from constants import FORMAT, TAGS, SIDES, TYPES
+
+__all__ = [
+    'FORMAT_REGEX',
+    'validateNames',
+    'splitCamelCases',
+    'joinCamelCases',
+]
+
+
+def _compileFormat(nameFormat, prefix=''):
+    """Compile the given name format in a regex with one named group per tag.
+
+    :param nameFormat: Name format, like '{side}_{info}_{type}_{num}'.
+    :type nameFormat: str
+
+    :param prefix: Pattern matched before the format, defaults to ''
+    :type prefix: str, optional
+
+    :rtype: re.RegexObject
+    """
+    fields = list(string.Formatter().parse(nameFormat))
+    separators = set(''.join(literal for literal, _, _, _ in fields))
+    token = '[^%s]+' % re.escape(''.join(separators | set('|:')))
+
+    pattern = prefix
+    for literal, tag, _, _ in fields:
+        pattern += re.escape(literal)
+        if tag:
+            pattern += '(?P<%s>%s)' % (tag, token)
+
+    return re.compile('^%s$' % pattern)
+
+
+FORMAT_REGEX = _compileFormat(FORMAT)
+
+# FORMAT regex matching full names, namespace and dag path included.
+_FULL_NAME_REGEX = _compileFormat(FORMAT, prefix=r'(?:.*[|:])?')
+
+# Check of the value of each tag, see validateNames.
+_SIDE_VALUES = frozenset(SIDES.values())
+_TYPE_VALUES = frozenset(TYPES.values())
+_TAG_CHECKS = {
+    'side': _SIDE_VALUES.__contains__,
+    'info': lambda value: value.isalnum(),
+    'type': _TYPE_VALUES.__contains__,
+    'num': lambda value: value.isdigit(),
+}
+
+
+def validateNames(names):
+    """Validate a whole list of node names against the FORMAT, the SIDES and
+    the TYPES, without instantiating any NameConvention.
+
+    :param names: Node names, like the mc.ls() output, or any iterator.
+    :type names: Iterable of str
+
+    :returns: Number of checked names and, for 'format' and each of the
+        TAGS, the list of the names failing it.
+        {'total': int, 'invalid': {tag: [name]}}
+    :rtype: dict
+
+    :Example:
+        import maya.cmds as mc
+        from rigIO.nameUtils import validateNames
+
+        report = validateNames(mc.ls())
+        report['invalid']['side']
+    """
+    match = _FULL_NAME_REGEX.match
+    checks = [(tag, _TAG_CHECKS.get(tag, bool)) for tag in TAGS]
+    invalid = dict((tag, []) for tag in ('format',) + TAGS)
+    invalidFormat = invalid['format']
+    columns = [(invalid[tag], check) for tag, check in checks]
+
+    total = 0
+    for name in names:
+        total += 1
+        result = match(name)
+        if result is None:
+            invalidFormat.append(name)
+            continue
+
+        for value, (column, check) in zip(result.groups(), columns):
+            if not check(value):
+                column.append(name)
+
+    return {'total': total, 'invalid': invalid}
+
+
+# Camel case tokens, like 'arm', 'Upper' or '01'.
+_CAMEL_CASE_REGEX = re.compile(r'[A-Z]?[a-z]+|[A-Z]+(?=[A-Z]|$)|[0-9]+')
+
+# Memoised splits and capitalized tokens, see splitCamelCases and
+# joinCamelCases.
+_SPLIT_CACHE = {}
+_CAPITALIZE_CACHE = {}
+_CAMEL_CASE_CACHE_SIZE = 10000
+
+
+def splitCamelCases(strings):
+    """Split each of the given strings according to the rules of the camel
+    case.
+
+    The splits are memoised, a repeated string returns the same tuple.
+
+    :param strings: Strings to split.
+    :type strings: Iterable of str
+
+    :returns: Tokens of each string.
+    :rtype: list(tuple(str))
+    """
+    findall = _CAMEL_CASE_REGEX.findall
+    cache = _SPLIT_CACHE
+    if len(cache) > _CAMEL_CASE_CACHE_SIZE:
+        cache.clear()
+
+    splits = []
+    for strArg in strings:
+        split = cache.get(strArg)
+        if split is None:
+            split = cache[strArg] = tuple(findall(strArg))
+        splits.append(split)
+
+    return splits
+
+
+def joinCamelCases(splits):
+    """Join each of the given token lists in a camel case string.
+
+    The first token is kept as is and the first letter of the other ones is
+    upper cased.
+
+    :param splits: Tokens of each string to join.
+    :type splits: Iterable of Sequence of str
+
+    :returns: Joined strings.
+    :rtype: list(str)
+    """
+    cache = _CAPITALIZE_CACHE
+    if len(cache) > _CAMEL_CASE_CACHE_SIZE:
+        cache.clear()
+
+    def capitalize(token):
+        capitalized = cache.get(token)
+        if capitalized is None:
+            capitalized = cache[token] = token[:1].upper()+token[1:]
+        return capitalized
+
+    return [split[0]+''.join(map(capitalize, split[1:])) if split else ''
+            for split in splits]
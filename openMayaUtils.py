@@ -1,23 +1,425 @@
+# Python libraries
+from collections import OrderedDict
+
 # Maya libraries
 import maya.cmds as mc
 import maya.api.OpenMaya as om
 
 
-def _getMFn(apiNode):
+# Reverse index of the MFn type constants to their function set class.
+# Built on first use, see _buildMFnTable().
+_MFN_TABLE = {}
+
+# Function set class resolved through the hasFn fallback, per api type.
+_MFN_FALLBACKS = {}
+
+
+def _buildMFnTable():
+    """Build once per session the reverse index from the MFn type constants
+    to their corresponding function set class.
+
+    :returns: Dictionary of api type to function set class.
+    :rtype: dict{int:type}
+    """
+    if _MFN_TABLE:
+        return _MFN_TABLE
+
+    for typeName in dir(om.MFn):
+        if not typeName.startswith('k'):
+            continue
+
+        fnClass = om.__dict__.get('MFn'+typeName[1:])
+        if fnClass is not None:
+            _MFN_TABLE[getattr(om.MFn, typeName)] = fnClass
+
+    return _MFN_TABLE
+
+
+def _getMFnClass(apiNode):
+    """Return the function set class matching the given api node.
+
+    If the api type of the node has no function set of its own, walk up the
+    hasFn inheritance chain and return the most derived function set the node
+    is compatible with. The result is cached per api type.
+
+    :param apiNode: Api node.
+    :type apiNode: om.MObject or om.MDagPath
+
+    :returns: Function set class or None.
+    :rtype: type
+    """
     kType = apiNode.apiType()
-    MFn = lambda *args, **kwargs: None
+    table = _buildMFnTable()
+
+    fnClass = table.get(kType)
+    if fnClass is not None:
+        return fnClass
+
+    if kType not in _MFN_FALLBACKS:
+        # Most derived function sets first.
+        candidates = sorted(
+            table.items(), key=lambda item: len(item[1].__mro__), reverse=True)
+        _MFN_FALLBACKS[kType] = next(
+            (cls for fnType, cls in candidates if apiNode.hasFn(fnType)), None)
+
+    return _MFN_FALLBACKS[kType]
+
+
+def _getMFn(apiNode):
+    fnClass = _getMFnClass(apiNode)
+    return fnClass(apiNode) if fnClass else None
+
+
+class NodeResolutionError(RuntimeError):
+    """Raised when some node names can't be resolved to a single Maya node.
+
+    :param unresolved: Names matching no node.
+    :type unresolved: list
+
+    :param ambiguous: Names matching more than one node.
+    :type ambiguous: list
+    """
+
+    def __init__(self, unresolved=(), ambiguous=()):
+        self.unresolved = list(unresolved)
+        self.ambiguous = list(ambiguous)
+
+        message = []
+        if self.unresolved:
+            message.append('No object matches name(s) : %s' % self.unresolved)
+        if self.ambiguous:
+            message.append('More than one object matches name(s) : %s'
+                           % self.ambiguous)
+        super(NodeResolutionError, self).__init__('\n'.join(message))
+
+
+def _resolve(names, getter):
+    """Resolve all the given names through a single MSelectionList.
+
+    :param names: Node names.
+    :type names: list
+
+    :param getter: Unbound MSelectionList method used to get the api node at
+        a given index, om.MSelectionList.getDependNode or
+        om.MSelectionList.getDagPath.
+    :type getter: function
+
+    :returns: Api nodes, in the order of the given names.
+    :rtype: list
+
+    :raises: NodeResolutionError
+    """
+    mSl = om.MSelectionList()
+    seen = set()
+    indices = {}
+    duplicates = []
+    unresolved = []
+    ambiguous = []
+
+    for name in names:
+        if name in seen:
+            continue
+        seen.add(name)
+
+        length = mSl.length()
+        try:
+            mSl.add(name)
+        except RuntimeError:
+            unresolved.append(name)
+            continue
+
+        added = mSl.length() - length
+        if added == 1:
+            indices[name] = length
+        elif added > 1:
+            ambiguous.append(name)
+        else:
+            # The node is already in the list under another name, the
+            # selection list merged it.
+            duplicates.append(name)
+
+    if unresolved or ambiguous:
+        raise NodeResolutionError(unresolved, ambiguous)
+
+    apiNodes = {}
+    for name, index in indices.items():
+        apiNodes[name] = getter(mSl, index)
+    for name in duplicates:
+        single = om.MSelectionList()
+        single.add(name)
+        apiNodes[name] = getter(single, 0)
+
+    return [apiNodes[name] for name in names]
+
+
+def _unindex(index, key, name):
+    """Remove the given name from the given index key."""
+    keys = index.get(key)
+    if keys is None:
+        return
+    keys.discard(name)
+    if not keys:
+        del index[key]
+
+
+class HandleCache(object):
+    """Session level cache of node names to their api handles.
+
+    Each entry keeps the om.MObjectHandle of the node and, for dag nodes, its
+    om.MDagPath. Entries are checked with isValid()/isAlive() on access,
+    evicted in least recently used order past maxSize, and dropped by the
+    callbacks once install() is called:
+        - node removed : the entries of the node.
+        - name changed : the entries of the node, the entries whose path goes
+          through its previous name and the partial names matching its new
+          name.
+        - parent added / removed : the entries of the node, the entries whose
+          path goes through it and the partial names matching it.
+        - node added : the partial names matching the new node, which could
+          now be ambiguous.
+        - new / open scene : all the entries.
+    The entries are indexed by node hash, path ancestor and leaf name, so the
+    callbacks never scan the whole cache.
+    """
+
+    def __init__(self, maxSize=20000):
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._keysByHash = {}
+        # Names by the node names of their dag path, leaf excluded.
+        self._keysByAncestor = {}
+        # Partial names, not starting with '|', by their leaf name.
+        self._keysByLeaf = {}
+        self._callbackIds = []
+
+    def __len__(self):
+        """len(x) <==> x.__len__()"""
+        return len(self._entries)
+
+    def __contains__(self, name):
+        """y in x <==> x.__contains__(y)"""
+        return name in self._entries
+
+    @property
+    def stats(self):
+        """Return the cache counters.
+
+        :rtype: dict{str:int}
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+        }
+
+    def resetStats(self):
+        """Reset the hit, miss and eviction counters."""
+        self.hits = self.misses = self.evictions = 0
+
+    def _lookup(self, name, dag):
+        """Return the valid cache entry of the given name or None."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+
+        handle, dagPath = entry
+        alive = handle.isValid() and handle.isAlive()
+        if not alive or (dagPath is not None and not dagPath.isValid()):
+            self.invalidate(name)
+            return None
+        if dag and dagPath is None:
+            return None
+
+        # Move the entry to the most recently used end.
+        del self._entries[name]
+        self._entries[name] = entry
+        return entry
 
-    if apiNode.hasFn(kType):
-        apiTypeStr = ''
-        for i in dir(om.MFn):
-            if kType == om.MFn.__getattribute__(om.MFn, i):
-                apiTypeStr = i
+    def _store(self, name, mObject, dagPath=None):
+        """Store the api handles of the given name."""
+        if self.maxSize <= 0:
+            return
 
-        fnName = 'MFn'+apiTypeStr[1:]
-        if fnName in dir(om):
-            MFn = om.__dict__[fnName]
+        if name in self._entries:
+            self.invalidate(name)
 
-    return MFn(apiNode)
+        handle = om.MObjectHandle(mObject)
+        self._entries[name] = (handle, dagPath)
+        self._keysByHash.setdefault(handle.hashCode(), set()).add(name)
+
+        parts = name.split('|')
+        if parts[0]:
+            self._keysByLeaf.setdefault(parts[-1], set()).add(name)
+        for ancestor in parts[:-1]:
+            if ancestor:
+                self._keysByAncestor.setdefault(ancestor, set()).add(name)
+
+        while len(self._entries) > self.maxSize:
+            oldest = next(iter(self._entries))
+            self.invalidate(oldest)
+            self.evictions += 1
+
+    def _get(self, names, dag):
+        """Return the cached api nodes of the given names, resolving all the
+        cache misses in one batch.
+        """
+        entries = [self._lookup(name, dag) for name in names]
+        missing = [n for n, entry in zip(names, entries) if entry is None]
+        self.hits += len(names) - len(missing)
+        self.misses += len(missing)
+
+        resolved = {}
+        if missing:
+            getter = om.MSelectionList.getDagPath if dag else \
+                om.MSelectionList.getDependNode
+            for name, apiNode in zip(missing, _resolve(missing, getter)):
+                if dag:
+                    self._store(name, apiNode.node(), apiNode)
+                else:
+                    self._store(name, apiNode)
+                resolved[name] = apiNode
+
+        result = []
+        for name, entry in zip(names, entries):
+            if entry is None:
+                result.append(resolved[name])
+            elif dag:
+                result.append(om.MDagPath(entry[1]))
+            else:
+                result.append(entry[0].object())
+
+        return result
+
+    def getMObjects(self, names):
+        """Return the MObjects of the given names.
+
+        :param names: Node names.
+        :type names: list
+
+        :rtype: list of om.MObject
+        """
+        return self._get(names, dag=False)
+
+    def getDagPaths(self, names):
+        """Return the MDagPaths of the given names.
+
+        :param names: Node names.
+        :type names: list
+
+        :rtype: list of om.MDagPath
+        """
+        return self._get(names, dag=True)
+
+    def invalidate(self, name=None):
+        """Drop the given name from the cache, or the whole cache if name is
+        None.
+
+        :param name: Node name, defaults to None
+        :type name: str, optional
+        """
+        if name is None:
+            self._entries.clear()
+            self._keysByHash.clear()
+            self._keysByAncestor.clear()
+            self._keysByLeaf.clear()
+            return
+
+        entry = self._entries.pop(name, None)
+        if entry is None:
+            return
+
+        _unindex(self._keysByHash, entry[0].hashCode(), name)
+        parts = name.split('|')
+        if parts[0]:
+            _unindex(self._keysByLeaf, parts[-1], name)
+        for ancestor in parts[:-1]:
+            if ancestor:
+                _unindex(self._keysByAncestor, ancestor, name)
+
+    def _invalidateKeys(self, index, key):
+        """Drop all the names of the given index key from the cache."""
+        for name in list(index.get(key, ())):
+            self.invalidate(name)
+
+    def invalidateNode(self, mObject):
+        """Drop all the cached names of the given node.
+
+        :param mObject: Api node.
+        :type mObject: om.MObject
+        """
+        self._invalidateKeys(
+            self._keysByHash, om.MObjectHandle(mObject).hashCode())
+
+    def _onNodeAdded(self, mObject, *args):
+        # Runs for every node Maya creates, file loads included.
+        if not self._keysByLeaf:
+            return
+        # A partial name matching the new node may now be ambiguous.
+        self._invalidateKeys(
+            self._keysByLeaf, om.MFnDependencyNode(mObject).name())
+
+    def _onNodeRemoved(self, mObject, *args):
+        self.invalidateNode(mObject)
+
+    def _onNameChanged(self, mObject, prevName, *args):
+        self.invalidateNode(mObject)
+
+        # The long names of the descendants contain the previous name.
+        if prevName:
+            self._invalidateKeys(self._keysByAncestor, prevName)
+        if om.MObjectHandle(mObject).isValid():
+            self._onNodeAdded(mObject)
+
+    def _onParentChanged(self, child, parent, *args):
+        mObject = child.node()
+        self.invalidateNode(mObject)
+
+        name = om.MFnDependencyNode(mObject).name()
+        self._invalidateKeys(self._keysByAncestor, name)
+        self._invalidateKeys(self._keysByLeaf, name)
+
+    def _onSceneChanged(self, *args):
+        self.invalidate()
+
+    def install(self):
+        """Register the Maya callbacks keeping the cache up to date."""
+        if self._callbackIds:
+            return
+
+        self._callbackIds = [
+            om.MDGMessage.addNodeAddedCallback(self._onNodeAdded),
+            om.MDGMessage.addNodeRemovedCallback(self._onNodeRemoved),
+            om.MNodeMessage.addNameChangedCallback(
+                om.MObject.kNullObj, self._onNameChanged),
+            om.MDagMessage.addParentAddedCallback(self._onParentChanged),
+            om.MDagMessage.addParentRemovedCallback(self._onParentChanged),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeNew, self._onSceneChanged),
+            om.MSceneMessage.addCallback(
+                om.MSceneMessage.kBeforeOpen, self._onSceneChanged),
+        ]
+
+    def uninstall(self):
+        """Remove the Maya callbacks and clear the cache."""
+        if self._callbackIds:
+            om.MMessage.removeCallbacks(self._callbackIds)
+        self._callbackIds = []
+        self.invalidate()
+
+
+# Session level handle cache used by getMObject and getDagPath.
+HANDLE_CACHE = HandleCache()
+
+
+def _cachedResolve(names, dag):
+    HANDLE_CACHE.install()
+    if dag:
+        return HANDLE_CACHE.getDagPaths(names)
+    return HANDLE_CACHE.getMObjects(names)
 
 
 def getMObject(shapes):
@@ -33,24 +435,25 @@ def getMObject(shapes):
     isList = not isinstance(shapes, basestring)
     shapes = shapes if isList else [shapes]
 
-    nodes = []
-    for shape in shapes:
-        mSl = om.MSelectionList()
-        mSl.add(shape)
-        nodes.append(mSl.getDependNode(0))
+    nodes = _cachedResolve(shapes, dag=False)
 
     return nodes if isList else nodes[0]
 
 
 def getDagPath(shapes):
+    """Return the corresponding MDagPath(s) of the given shape(s).
+
+    :param shapes: Node(s) name.
+    :type shapes: str or list
+
+    :returns: Corresponding MDagPath(s) of the given shape(s)
+        The return type depends on the shapes parameter type.
+    :rtype: om.MDagPath or list
+    """
     isList = not isinstance(shapes, basestring)
     shapes = shapes if isList else [shapes]
 
-    nodes = []
-    for shape in shapes:
-        mSl = om.MSelectionList()
-        mSl.add(shape)
-        nodes.append(mSl.getDagPath(0))
+    nodes = _cachedResolve(shapes, dag=True)
 
     return nodes if isList else nodes[0]
 
@@ -59,7 +462,7 @@ def getMDagPathMFn(nodes):
     isList = not isinstance(nodes, basestring)
     nodes = nodes if isList else [nodes]
 
-    apiNodes = [getDagPath(node) for node in nodes]
+    apiNodes = getDagPath(nodes)
     MFns = [_getMFn(apiNode) for apiNode in apiNodes]
 
     return (apiNodes, MFns) if isList else (apiNodes[0], MFns[0])
@@ -69,7 +472,7 @@ def getMObjMFn(nodes):
     isList = not isinstance(nodes, basestring)
     nodes = nodes if isList else [nodes]
 
-    apiNodes = [getMObject(node) for node in nodes]
+    apiNodes = getMObject(nodes)
     MFns = [_getMFn(apiNode) for apiNode in apiNodes]
 
     return (apiNodes, MFns) if isList else (apiNodes[0], MFns[0])
@@ -78,3 +481,72 @@ def getMObjMFn(nodes):
 def getMFn(nodes):
     _, MFns = getMObjMFn(nodes)
     return MFns
+
+
+def iterDescendants(roots, depth=None, objectType=None, prune=None,
+                    includeRoots=False):
+    """Walk the dag hierarchy under the given root(s) with an MItDag.
+
+    The nodes are yielded parent first, in the same order as the reversed
+    mc.listRelatives(roots, allDescendents=True, fullPath=True) result, so
+    the roots are walked from the last one to the first one.
+
+    :param roots: Dag node(s) name.
+    :type roots: str or list
+
+    :param depth: Maximum depth under the roots, defaults to None for the
+        whole hierarchy.
+    :type depth: int, optional
+
+    :param objectType: Only yield the nodes of this type, checked during the
+        walk. Either a node type name, its derived types included as for
+        mc.ls(type=...), or an MFn api type. Defaults to None.
+    :type objectType: str or int, optional
+
+    :param prune: Called with the MDagPath of each node, if it returns True
+        the node and its descendants are skipped. Defaults to None.
+    :type prune: function, optional
+
+    :param includeRoots: If True, also yield the roots, defaults to False
+    :type includeRoots: bool, optional
+
+    :returns: Full path name of the descendants.
+    :rtype: generator of str
+    """
+    isList = not isinstance(roots, basestring)
+    roots = roots if isList else [roots]
+
+    typeNames = None
+    if isinstance(objectType, basestring):
+        typeNames = frozenset(
+            mc.nodeType(objectType, derived=True, isTypeName=True) or
+            [objectType])
+
+    iterator = om.MItDag(om.MItDag.kDepthFirst)
+    for root in reversed(getDagPath(list(roots))):
+        iterator.reset(root, om.MItDag.kDepthFirst)
+        rootDepth = iterator.depth()
+
+        while not iterator.isDone():
+            level = iterator.depth() - rootDepth
+            path = iterator.getPath()
+
+            if prune is not None and level and prune(path):
+                iterator.prune()
+                iterator.next()
+                continue
+
+            if level or includeRoots:
+                if typeNames is not None:
+                    matches = om.MFnDagNode(path).typeName in typeNames
+                elif objectType is not None:
+                    matches = path.hasFn(objectType)
+                else:
+                    matches = True
+
+                if matches:
+                    yield path.fullPathName()
+
+            if depth is not None and level >= depth:
+                iterator.prune()
+            iterator.next()
@@ -0,0 +1,204 @@
+# Maya libraries
+import maya.cmds as mc
+import maya.api.OpenMaya as om
+
+# RigIO libraries
+from bulk import BulkOperation
+from constants import FORMAT, TYPES, SIDES, CENTER, DEFAULTS
+from nameConvention import NameConvention, getTypeSuffixes
+from openMayaUtils import getMObject
+
+__all__ = [
+    'RenameError',
+    'planRenames',
+    'rename',
+]
+
+_TYPE_VALUES = frozenset(TYPES.values())
+_DEFAULTS = frozenset(DEFAULTS)
+
+
+def _nextNum(num):
+    """Return the num tag following the given one, keeping its padding,
+    like '09' -> '10'.
+
+    :param num: Num tag.
+    :type num: str
+
+    :rtype: str
+    """
+    return str(int(num) + 1).zfill(len(num))
+
+
+class RenameError(RuntimeError):
+    """Raised when the renames of rigIO.rename.rename fail midway, some of
+    the nodes may already be renamed.
+
+    :param message: Error message.
+    :type message: str
+
+    :param plan: Rename plan, see planRenames.
+    :type plan: list(tuple(str, str))
+
+    :param modifier: Modifier used to rename the nodes, its undoIt() method
+        reverts the renames already done.
+    :type modifier: om.MDagModifier
+    """
+
+    def __init__(self, message, plan, modifier):
+        super(RenameError, self).__init__(message)
+        self.plan = plan
+        self.modifier = modifier
+
+
+def planRenames(nodes, side=None, info=None, type=None, num=None):
+    """Compute the new name of each given node according to the FORMAT.
+
+    Every tag not given is taken from the current name through
+    NameConvention, the type tag falls back on the suffix of the node type.
+    A name out of the FORMAT only gives its info tag, its side defaults to
+    the center side. An empty nodes list plans nothing.
+    The name clashes are resolved in memory by incrementing the num tag, the
+    current names of the scene, renamed nodes included, are all considered
+    taken so the renames can't clash whatever their order. Default, read
+    only and locked (lockNode) nodes, and nodes already named as planned, are
+    left out.
+
+    :param nodes: Node(s) name.
+    :type nodes: str or list
+
+    :param side: Side tag of all the nodes, defaults to None
+    :type side: str, optional
+
+    :param info: Info tag of all the nodes, defaults to None
+    :type info: str, optional
+
+    :param type: Type tag of all the nodes, defaults to None
+    :type type: str, optional
+
+    :param num: First num tag of all the nodes, defaults to None
+    :type num: str, optional
+
+    :returns: Long name and new name of each node to rename, deepest dag
+        nodes first so each long name is still valid when its turn comes.
+    :rtype: list(tuple(str, str))
+    """
+    # mc.ls([]) would list the whole scene.
+    if not nodes:
+        return []
+
+    longNames = mc.ls(nodes, long=True) or []
+    if not longNames:
+        return []
+
+    readOnly = set(mc.ls(longNames, readOnly=True, long=True) or [])
+    locked = mc.lockNode(longNames, query=True, lock=True) or []
+    longNames = [name for name, isLocked in zip(longNames, locked)
+                 if not isLocked and name not in readOnly and
+                 name.split('|')[-1] not in _DEFAULTS]
+    if not longNames:
+        return []
+
+    suffixes = getTypeSuffixes(longNames)
+    existing = set(name.split('|')[-1] for name in mc.ls() or [])
+
+    plan = []
+    for longName, suffix in zip(longNames, suffixes):
+        leaf = longName.split('|')[-1]
+        namespace = leaf.rpartition(':')[0]
+        prefix = namespace+':' if namespace else ''
+
+        nameConvention = NameConvention(
+            longName, side=side, info=info, type=type, num=num)
+
+        # The side, type and num of a name out of the FORMAT are guesses,
+        # like 'r' for rootJoint01, only the given ones are kept.
+        if nameConvention.isFormat:
+            nodeSide, nodeType, nodeNum = (
+                nameConvention.side, nameConvention.type, nameConvention.num)
+        else:
+            nodeSide, nodeType, nodeNum = side, type, num
+
+        if type is None and nodeType not in _TYPE_VALUES and suffix:
+            nodeType = suffix
+
+        if not nodeNum or not nodeNum.isdigit():
+            nodeNum = '1'
+
+        tags = {
+            'side': nodeSide or SIDES[CENTER],
+            'info': nameConvention.info or nodeType,
+            'type': nodeType,
+            'num': nodeNum,
+        }
+        target = prefix + FORMAT.format(**tags)
+        while target != leaf and target in existing:
+            tags['num'] = _nextNum(tags['num'])
+            target = prefix + FORMAT.format(**tags)
+
+        if target == leaf:
+            continue
+
+        existing.add(target)
+        plan.append((longName, target))
+
+    plan.sort(key=lambda item: item[0].count('|'), reverse=True)
+    return plan
+
+
+def rename(nodes, side=None, info=None, type=None, num=None, dryRun=False):
+    """Rename the given nodes according to the FORMAT, see planRenames.
+
+    All the renames go through a single MDagModifier in one bulk operation.
+    Maya undo does not revert them, call undoIt() on the returned modifier
+    instead.
+
+    :param nodes: Node(s) name.
+    :type nodes: str or list
+
+    :param side: Side tag of all the nodes, defaults to None
+    :type side: str, optional
+
+    :param info: Info tag of all the nodes, defaults to None
+    :type info: str, optional
+
+    :param type: Type tag of all the nodes, defaults to None
+    :type type: str, optional
+
+    :param num: First num tag of all the nodes, defaults to None
+    :type num: str, optional
+
+    :param dryRun: If True, return the rename plan without renaming anything,
+        defaults to False
+    :type dryRun: bool, optional
+
+    :returns: The rename plan if dryRun is True, else the modifier used to
+        rename the nodes, its undoIt() method reverts the renames.
+    :rtype: list(tuple(str, str)) or om.MDagModifier
+
+    :raises: RenameError, holding the modifier, if the renames fail midway.
+
+    :Example:
+        import maya.cmds as mc
+        import rigIO.rename
+
+        rigIO.rename.rename(mc.ls(sl=True), side='l', dryRun=True)
+    """
+    plan = planRenames(nodes, side=side, info=info, type=type, num=num)
+    if dryRun:
+        return plan
+
+    modifier = om.MDagModifier()
+    if not plan:
+        return modifier
+
+    with BulkOperation('%s.rename' % __name__, undoChunk=False):
+        mObjects = getMObject([longName for longName, _ in plan])
+        for mObject, (_, newName) in zip(mObjects, plan):
+            modifier.renameNode(mObject, newName)
+        try:
+            modifier.doIt()
+        except RuntimeError as error:
+            raise RenameError(str(error), plan, modifier)
+
+    return modifier
@@ -1,31 +1,540 @@
 # Python libraries
+import re
 import json
+import array
+import itertools
 
 # Maya libraries
 import maya.cmds as mc
 import maya.OpenMaya as om
+import maya.api.OpenMaya as om2
+
+# RigIO libraries
+from bulk import bulkOperation
+from mirror import getMirrorIndex
+import openMayaUtils
+from constants import TAGS, TAG_NUM
+
+
+# Component type to component attribute name, for the single indexed
+# components kept as index arrays.
+_COMPONENT_NAMES = {
+    om2.MFn.kMeshVertComponent: 'vtx',
+    om2.MFn.kMeshEdgeComponent: 'e',
+    om2.MFn.kMeshPolygonComponent: 'f',
+    om2.MFn.kMeshMapComponent: 'map',
+    om2.MFn.kCurveCVComponent: 'cv',
+    om2.MFn.kCurveEPComponent: 'ep',
+}
+
+# Selection mode to MGlobal list adjustment.
+_LIST_ADJUSTMENTS = {
+    'replace': om2.MGlobal.kReplaceList,
+    'add': om2.MGlobal.kAddToList,
+    'deselect': om2.MGlobal.kRemoveFromList,
+    'toggle': om2.MGlobal.kXORWithList,
+}
+
+
+def _toRanges(indices):
+    """Compress the given indices in runs of consecutive indices.
+
+    :param indices: Component indices.
+    :type indices: Iterable of int
+
+    :returns: Flat (first, last) index of each run, a run can go up or down.
+    :rtype: array.array
+    """
+    ranges = array.array('l')
+    first = last = step = None
+
+    for index in indices:
+        if first is None:
+            first = last = index
+        elif step is None and abs(index - last) == 1:
+            step = index - last
+            last = index
+        elif step is not None and index - last == step:
+            last = index
+        else:
+            ranges.extend((first, last))
+            first = last = index
+            step = None
+
+    if first is not None:
+        ranges.extend((first, last))
+
+    return ranges
+
+
+def _fromRanges(ranges):
+    """Expand the given runs of indices.
+
+    :param ranges: Flat (first, last) index of each run.
+    :type ranges: array.array
+
+    :rtype: generator of int
+    """
+    for position in range(0, len(ranges), 2):
+        first, last = ranges[position], ranges[position+1]
+        step = 1 if last >= first else -1
+        for index in range(first, last+step, step):
+            yield index
+
+
+class Component(object):
+    """Compact selection item : a node, or a dag path with a single indexed
+    component type and its indices stored as runs of consecutive indices.
+    """
+    __slots__ = ('path', 'type', 'ranges')
+
+    def __init__(self, path, componentType=None, indices=()):
+        """x.__init__(path, componentType, indices) <==> x(...)
+
+        :param path: Long name of the node, or the string of the item if
+            componentType is None.
+        :type path: str
+
+        :param componentType: MFn component type, defaults to None
+        :type componentType: int, optional
+
+        :param indices: Component indices, defaults to ()
+        :type indices: Iterable of int, optional
+        """
+        self.path = path
+        self.type = componentType
+        self.ranges = _toRanges(indices)
+
+    def __repr__(self):
+        """x.__repr__() <==> repr(x)"""
+        return '%s(%r)' % (self.__class__.__name__, self.names(flatten=False))
+
+    def __len__(self):
+        """len(x) <==> x.__len__()"""
+        if self.type is None:
+            return 1
+        ranges = self.ranges
+        return sum(abs(ranges[i+1] - ranges[i]) + 1
+                   for i in range(0, len(ranges), 2))
+
+    @property
+    def indices(self):
+        """Return the component indices.
+
+        :rtype: list of int
+        """
+        return list(_fromRanges(self.ranges))
+
+    def reversed(self):
+        """Return the component with its indices in reverse order.
+
+        :rtype: Component
+        """
+        component = Component(self.path, self.type)
+        for position in range(len(self.ranges)-2, -1, -2):
+            component.ranges.extend(
+                (self.ranges[position+1], self.ranges[position]))
+        return component
+
+    def sorted(self):
+        """Return the component with its indices in ascending order.
+
+        :rtype: Component
+        """
+        return Component(self.path, self.type, sorted(set(self.indices)))
+
+    def names(self, flatten=True):
+        """Expand the component to Maya strings.
+
+        :param flatten: If True, return one string per index, else one string
+            per run of indices, defaults to True
+        :type flatten: bool, optional
+
+        :rtype: list of str
+        """
+        if self.type is None:
+            return [self.path]
+
+        prefix = '%s.%s' % (self.path, _COMPONENT_NAMES[self.type])
+        if flatten:
+            return ['%s[%d]' % (prefix, index) for index in self.indices]
+
+        names = []
+        for position in range(0, len(self.ranges), 2):
+            first, last = sorted(self.ranges[position:position+2])
+            if first == last:
+                names.append('%s[%d]' % (prefix, first))
+            else:
+                names.append('%s[%d:%d]' % (prefix, first, last))
+        return names
+
+    def addTo(self, selectionList):
+        """Add the component to the given selection list.
+
+        :param selectionList: Selection list to add the component to.
+        :type selectionList: om2.MSelectionList
+        """
+        if self.type is None:
+            selectionList.add(self.path)
+            return
+
+        dagList = om2.MSelectionList()
+        dagList.add(self.path)
+        componentFn = om2.MFnSingleIndexedComponent()
+        component = componentFn.create(self.type)
+        componentFn.addElements(self.indices)
+        selectionList.add((dagList.getDagPath(0), component))
+
+
+def _getComponents(selectionList):
+    """Convert the given selection list in compact Component items.
+
+    :param selectionList: Selection list to convert.
+    :type selectionList: om2.MSelectionList
+
+    :rtype: tuple of Component
+    """
+    components = []
+    for index in range(selectionList.length()):
+        try:
+            dagPath, component = selectionList.getComponent(index)
+        except (RuntimeError, TypeError):
+            # Dependency node.
+            node = selectionList.getDependNode(index)
+            components.append(
+                Component(om2.MFnDependencyNode(node).absoluteName()))
+            continue
+
+        if component.isNull():
+            components.append(Component(dagPath.fullPathName()))
+        elif component.apiType() in _COMPONENT_NAMES:
+            indices = om2.MFnSingleIndexedComponent(component).getElements()
+            components.append(
+                Component(dagPath.fullPathName(), component.apiType(), indices))
+        else:
+            # Multi indexed components are kept as flattened strings.
+            strings = selectionList.getSelectionStrings(index)
+            components.extend(
+                Component(name) for name in
+                mc.ls(strings, fl=True, l=True) or [])
+
+    return tuple(components)
+
+
+_DIGITS = re.compile(r'(\d+)')
+
+
+def _naturalKey(name):
+    """Return the natural sort key of the given name, its numbers are compared
+    as numbers ('ctrl_2' < 'ctrl_10').
+
+    :param name: Name to get the key of.
+    :type name: str
+
+    :rtype: tuple
+    """
+    return tuple(int(token) if position % 2 else token.lower()
+                 for position, token in enumerate(_DIGITS.split(name)))
+
+
+def _nameKeys(items):
+    return items
+
+
+def _naturalKeys(items):
+    return [_naturalKey(item) for item in items]
+
+
+def _depthKeys(items):
+    return [(item.count('|'), _naturalKey(item)) for item in items]
+
+
+def _dagKeys(items):
+    """Position of each item in a depth first walk of the whole dag, from the
+    sibling index of each of its ancestors. The children of each parent are
+    queried once.
+    """
+    children = {'': mc.ls(assemblies=True, long=True) or []}
+    siblingIndices = {}
+
+    def siblingIndex(path):
+        parent = path.rpartition('|')[0]
+        if parent not in siblingIndices:
+            if parent not in children:
+                children[parent] = mc.listRelatives(
+                    parent, children=True, fullPath=True) or []
+            siblingIndices[parent] = dict(
+                (child, index) for index, child in enumerate(children[parent]))
+        return siblingIndices[parent].get(path, -1)
+
+    keys = []
+    for item in items:
+        path = item.split('.')[0]
+        if not path.startswith('|'):
+            # Not a dag node, after all the dag nodes.
+            keys.append(((float('inf'),), _naturalKey(item)))
+            continue
+
+        tokens = path.split('|')
+        ancestors = ['|'.join(tokens[:end]) for end in range(2, len(tokens)+1)]
+        keys.append((tuple(siblingIndex(i) for i in ancestors), ()))
+
+    return keys
+
+
+def _nodeTypeKeys(items):
+    """Node type of each item, queried with a single mc.ls call."""
+    typed = mc.ls(items, showType=True, long=True) or []
+    nodeTypes = dict(zip(typed[::2], typed[1::2]))
+    return [(nodeTypes.get(item, ''), _naturalKey(item)) for item in items]
+
+
+def _tagKeys(tag):
+    position = TAGS.index(tag)
+
+    def tagKeys(items):
+        keys = []
+        for item in items:
+            niceName = item.split('|')[-1].split(':')[-1]
+            split = niceName.split('_')
+            value = split[position] if len(split) == TAG_NUM else ''
+            keys.append((_naturalKey(value), _naturalKey(item)))
+        return keys
+
+    return tagKeys
+
+
+# Sort mode to the function computing the sort key of a list of items.
+_SORT_KEYS = {
+    'name': _nameKeys,
+    'natural': _naturalKeys,
+    'depth': _depthKeys,
+    'dag': _dagKeys,
+    'nodetype': _nodeTypeKeys,
+}
+_SORT_KEYS.update((tag.lower(), _tagKeys(tag)) for tag in TAGS)
+
+
+def _sortKeys(items, mode):
+    """Compute in one batch the sort key of each of the given items.
+
+    :param items: Long names to sort.
+    :type items: list of str
+
+    :param mode: Sort mode, or list of sort modes for a multi key sort.
+    :type mode: str or list of str
+
+    :rtype: list
+
+    :raises: ValueError
+    """
+    modes = [mode] if isinstance(mode, basestring) else list(mode)
+
+    columns = []
+    for mode in modes:
+        keysFunction = _SORT_KEYS.get(str(mode).lower())
+        if keysFunction is None:
+            raise ValueError('Unknown sort mode : %s, expected one of %s.' % (
+                mode, sorted(_SORT_KEYS)))
+        columns.append(keysFunction(items))
+
+    return columns[0] if len(columns) == 1 else list(zip(*columns))
+
+
+def _isFullDagPath(item):
+    """Check if the given item is a full dag path, as listed by mc.ls with
+    the long flag, and not a component or a plug.
+
+    :param item: Selected item.
+    :type item: str
+
+    :rtype: bool
+    """
+    return isinstance(item, basestring) and item.startswith('|') and \
+        '.' not in item and '->' not in item
+
+
+class _SelectionState(object):
+    """Cached snapshot of the Maya selection.
+
+    The snapshot is stamped with a version number, bumped by a SelectionChanged
+    callback, and only re-queried when the selection changed since the last
+    snapshot.
+    """
+
+    def __init__(self):
+        self.version = 0
+        self._snapshotVersion = None
+        self._items = tuple()
+        self._itemSet = frozenset()
+        self._componentsVersion = None
+        self._components = tuple()
+        self._callbackId = None
+
+    def _onSelectionChanged(self, *args):
+        self.version += 1
+
+    def install(self):
+        """Register the SelectionChanged callback invalidating the snapshot.
+        """
+        if self._callbackId is None:
+            self._callbackId = om.MEventMessage.addEventCallback(
+                'SelectionChanged', self._onSelectionChanged)
+
+    def uninstall(self):
+        """Remove the SelectionChanged callback.
+        """
+        if self._callbackId is not None:
+            om.MMessage.removeCallback(self._callbackId)
+        self._callbackId = None
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the next access to query the Maya selection again.
+        """
+        self.version += 1
+
+    def cachedItemSet(self):
+        """Return the current snapshot as a set, or an empty set if the
+        selection changed since, without querying the Maya selection.
+
+        :rtype: frozenset
+        """
+        if self._snapshotVersion != self.version:
+            return frozenset()
+        if self._itemSet is None:
+            self._itemSet = frozenset(self._items)
+        return self._itemSet
+
+    def seed(self, items, known=frozenset()):
+        """Set the snapshot to the given items, just selected in replace
+        mode, so the next access doesn't query the Maya selection again.
+
+        The items are only used if they all have the mc.ls(sl=True, fl=True,
+        l=True) form, as items of the previous snapshot or full dag paths.
+        Else the snapshot is left invalidated.
+
+        :param items: Selected items, in their selection order.
+        :type items: list of str
+
+        :param known: Items of the previous snapshot, see cachedItemSet.
+        :type known: frozenset, optional
+
+        :returns: True if the snapshot was seeded.
+        :rtype: bool
+        """
+        for item in items:
+            if item not in known and not _isFullDagPath(item):
+                return False
+
+        self.install()
+        seen = set()
+        self._items = tuple(
+            item for item in items if not (item in seen or seen.add(item)))
+        self._itemSet = frozenset(seen)
+        self._snapshotVersion = self.version
+        return True
+
+    def _update(self):
+        self.install()
+        if self._snapshotVersion != self.version:
+            self._items = tuple(mc.ls(sl=True, fl=True, l=True) or [])
+            self._itemSet = None
+            self._snapshotVersion = self.version
+
+    @property
+    def items(self):
+        """Return the current Maya selection.
+
+        :rtype: tuple
+        """
+        self._update()
+        return self._items
+
+    @property
+    def itemSet(self):
+        """Return the current Maya selection as a set for O(1) membership.
+
+        :rtype: frozenset
+        """
+        self._update()
+        if self._itemSet is None:
+            self._itemSet = frozenset(self._items)
+        return self._itemSet
+
+    @property
+    def components(self):
+        """Return the current Maya selection as compact Component items,
+        without flattening the component selections.
+
+        :rtype: tuple of Component
+        """
+        self.install()
+        if self._componentsVersion != self.version:
+            self._components = _getComponents(
+                om2.MGlobal.getActiveSelectionList())
+            self._componentsVersion = self.version
+        return self._components
+
+
+# Selection snapshot shared by all the Selection instances.
+_STATE = _SelectionState()
 
 
 class Selection(object):
     """ Simple class to manage selection in Maya.
     """
 
-    def __init__(self):
-        self._selection = self.selection
+    # Report modes of the view method.
+    REPORT_OFF = 'off'
+    REPORT_SUMMARY = 'summary'
+    REPORT_LIST = 'list'
+
+    def __init__(self, componentMode=False, report=REPORT_LIST, reportLimit=50):
+        """x.__init__(componentMode, report, reportLimit) <==> x(...)
+
+        :param componentMode: If True, the methods work on compact Component
+            items instead of flattened strings, defaults to False
+        :type componentMode: bool, optional
+
+        :param report: What the methods print in the script editor,
+            defaults to REPORT_LIST
+            off : Nothing.
+            summary : The number of selected items.
+            list : The selected items, truncated after reportLimit items.
+        :type report: str, optional
+
+        :param reportLimit: Maximum number of items listed by the list report,
+            defaults to 50. None for no limit.
+        :type reportLimit: int, optional
+        """
+        self.componentMode = componentMode
+        self.report = report
+        self.reportLimit = reportLimit
+        self._selection = self.components if componentMode else self.selection
         self.mode = "replace"
 
     def __repr__(self):
         """x.__repr__() <==> repr(x)"""
-        return self.__class__.__name__+' : '+str(self.selection)
+        return self.__class__.__name__+' : '+str(list(self.selection))
+
+    def __contains__(self, item):
+        """y in x <==> x.__contains__(y)
+
+        :param item: Long name of a node or component.
+        :type item: str
+        """
+        return item in _STATE.itemSet
 
     @property
     def selection(self):
         """Return the current Maya selection.
+        The selection is cached until it changes.
 
         :returns: Current Maya selection.
-        :rtype: list
+        :rtype: tuple
         """
-        return mc.ls(sl=True, fl=True, l=True)
+        return _STATE.items
 
     @selection.setter
     def selection(self, selection):
@@ -34,8 +543,47 @@ class Selection(object):
         :param selection: Object to select.
         :type selection: list
         """
+        known = _STATE.cachedItemSet()
         self._selection = selection
         mc.select(self._selection, **{self.mode: 1})
+        _STATE.invalidate()
+        if self.mode == "replace" and self._selection:
+            _STATE.seed(list(self._selection), known)
+
+    @property
+    def selectionSet(self):
+        """Return the current Maya selection as a set.
+
+        :returns: Current Maya selection.
+        :rtype: frozenset
+        """
+        return _STATE.itemSet
+
+    @property
+    def components(self):
+        """Return the current Maya selection as compact Component items.
+        The component selections are not flattened.
+
+        :returns: Current Maya selection.
+        :rtype: tuple of Component
+        """
+        return _STATE.components
+
+    @components.setter
+    def components(self, components):
+        """Set the current selection with the given Component items.
+
+        :param components: Items to select.
+        :type components: Iterable of Component
+        """
+        selectionList = om2.MSelectionList()
+        for component in components:
+            component.addTo(selectionList)
+
+        self._selection = components
+        om2.MGlobal.setActiveSelectionList(
+            selectionList, _LIST_ADJUSTMENTS[self.mode])
+        _STATE.invalidate()
 
     def _viewSelection(func):
         """Decorator to automatically add a return to the class function and
@@ -55,82 +603,158 @@ class Selection(object):
         def wrapper(self, *args, **kwargs):
             func(self, *args, **kwargs)
             self.view()
-            return self.selection
+            return self.components if self.componentMode else self.selection
 
         return wrapper
 
-    def view(self):
+    def view(self, report=None):
         """Print in the Maya's script editor the current selection.
+        Nothing is formatted when the report is off.
+
+        :param report: Report mode, defaults to None for the report attribute.
+        :type report: str, optional
         """
+        report = self.report if report is None else report
+        if report == self.REPORT_OFF:
+            return
+
+        if self.componentMode:
+            items = self.components
+            count = sum(len(component) for component in items)
+        else:
+            items = self.selection
+            count = len(items)
+
+        if report == self.REPORT_SUMMARY:
+            om.MGlobal.displayInfo(
+                'Result: %d selected item(s).' % count)
+            return
+
+        if self.componentMode:
+            names = (name for component in items
+                     for name in component.names(flatten=False))
+        else:
+            names = iter(items)
+
+        readableSelection = [
+            i.split('|')[-1] for i in itertools.islice(names, self.reportLimit)]
+
         selectionString = "Result: "
-        readableSelection = [i.split('|')[-1] for i in self.selection]
         selectionString += json.dumps(readableSelection, indent=4)
+        if next(names, None) is not None:
+            selectionString += '\n... %d selected item(s) in total.' % count
         om.MGlobal.displayInfo(selectionString)
 
     @_viewSelection
+    @bulkOperation
     def reverseOrder(self):
         """Reverse the order of your current selection.
         """
         self.mode = "replace"
-        self.selection = self.selection[::-1]
+        if self.componentMode:
+            self.components = [i.reversed() for i in self.components[::-1]]
+        else:
+            self.selection = list(self.selection[::-1])
 
     @_viewSelection
+    @bulkOperation
     def sort(self, mode="name"):
         """Sort the current selection according to the given mode.
+        The sort keys of the whole selection are computed once, in one batch.
 
         :param mode: defaults to "name"
-            Can be set to 'name'.
+            Can be set to one or a list of (for a multi key sort) :
             name : Will sort your current selection by alphabetical order.
-        :type mode: str, optional
+            natural : By alphabetical order, numbers compared as numbers.
+            depth : By hierarchy depth.
+            dag : By dag order.
+            nodeType : By node type.
+            side, info, type, num : By name convention tag.
+        :type mode: str or list of str, optional
+
+        :raises: ValueError
         """
-        if str(mode).lower() == "name":
-            self.selection = sorted(self.selection)
+        if self.componentMode:
+            components = [i.sorted() for i in self.components]
+            keys = _sortKeys([i.path for i in components], mode)
+            order = sorted(range(len(components)),
+                           key=lambda i: (keys[i], components[i].type or 0))
+            self.components = [components[i] for i in order]
+        else:
+            selection = list(self.selection)
+            keys = _sortKeys(selection, mode)
+            order = sorted(range(len(selection)), key=keys.__getitem__)
+            self.selection = [selection[i] for i in order]
 
     @_viewSelection
-    def hierarchy(self):
+    @bulkOperation
+    def hierarchy(self, depth=None):
         """Select the all the decedent of your current selection.
+
+        :param depth: Maximum depth under the selected nodes, defaults to None
+            for the whole hierarchy.
+        :type depth: int, optional
         """
         self.mode = "replace"
-        self.selection += \
-            (mc.listRelatives(self.selection, ad=1, f=1) or [])[::-1]
+        selection = list(self.selection)
+        # mc.ls([]) would list the whole scene.
+        if not selection:
+            return
+
+        roots = mc.ls(selection, type='dagNode', long=True) or []
+        self.selection = selection + \
+            list(openMayaUtils.iterDescendants(roots, depth=depth))
 
     @_viewSelection
-    def typeUnder(self, objectType, mode="replace"):
+    @bulkOperation
+    def typeUnder(self, objectType, mode="replace", depth=None):
         """Select all the descendant matching the given objectType under your
         current selection.
 
-        :param objectType: [description]
-        :type objectType: [type]
+        :param objectType: Node type name, its derived types included, or MFn
+            api type.
+        :type objectType: str or int
 
-        :param mode: [description], defaults to "replace"
+        :param mode: Selection mode, defaults to "replace"
         :type mode: str, optional
+
+        :param depth: Maximum depth under the selected nodes, defaults to None
+            for the whole hierarchy.
+        :type depth: int, optional
         """
         self.mode = mode
-        allDescendent = (
-            self.selection +
-            (mc.listRelatives(self.selection, ad=1, f=1) or [])[::-1])
-        self.selection = mc.ls(allDescendent, type=objectType) or []
+        selection = list(self.selection)
+        # mc.ls([]) would list the whole scene.
+        if not selection:
+            return
+
+        roots = mc.ls(selection, type='dagNode', long=True) or []
+
+        if isinstance(objectType, basestring):
+            matches = mc.ls(selection, type=objectType, long=True) or []
+        else:
+            matches = list(openMayaUtils.iterDescendants(
+                roots[::-1], depth=0, objectType=objectType,
+                includeRoots=True))
+
+        self.selection = matches + list(openMayaUtils.iterDescendants(
+            roots, depth=depth, objectType=objectType))
 
     @_viewSelection
+    @bulkOperation
     def mirror(self, mode="replace"):
-        """[summary]
+        """Select the mirrored node(s) of your current selection, through the
+        scene mirror index (see rigIO.mirror). The center nodes are mirrored
+        on themselves, the nodes without side tag are dropped. The index gives
+        node names without dag path, they are resolved with mc.ls so all the
+        nodes sharing a mirrored name are selected.
 
-        [description]
-        :param mode: [description], defaults to "replace"
+        :param mode: Selection mode, defaults to "replace"
         :type mode: str, optional
         """
         self.mode = mode
-        sides = ['l_', 'r_']
-        mirrObj = []
-        for obj in self.selection:
-            objN = obj.split('|')[-1]
-            nms = ':'.join(objN.split(':')[:-1])
-            objN = objN.split(':')[-1]
-            currSide = objN[:2]
-            for i, side in enumerate(sides):
-                if currSide == side:
-                    objN = objN.replace(objN[:len(side)], sides[1-i])
-                    objN = ':'.join([nms, objN]) if nms else objN
-                    mirrObj.append(objN)
-
-        self.selection = mc.ls(mirrObj)
+        mirrorIndex = getMirrorIndex()
+        mirrObj = [mirrorIndex.get(obj) for obj in self.selection]
+        mirrObj = [obj for obj in mirrObj if obj]
+
+        self.selection = mc.ls(mirrObj) if mirrObj else []
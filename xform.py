@@ -1,49 +1,163 @@
-import pymel.core as pm
+# Maya libraries
+import maya.cmds as mc
+import maya.api.OpenMaya as om
 
+# RigIO libraries
+import openMayaUtils
+from bulk import bulkOperation
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def _localMatrices(worldMatrix, parentInverseMatrices):
+    """Compute in bulk the local matrices matching the given world matrix
+    under each of the given parent inverse matrices.
+
+    :param worldMatrix: Wanted world space matrix.
+    :type worldMatrix: om.MMatrix
+
+    :param parentInverseMatrices: Parent inverse matrix of each destination.
+    :type parentInverseMatrices: list of om.MMatrix
+
+    :returns: Local matrix of each destination.
+    :rtype: list of om.MMatrix
+    """
+    if np is None:
+        return [worldMatrix * matrix for matrix in parentInverseMatrices]
+
+    world = np.array(list(worldMatrix), dtype=np.float64).reshape(4, 4)
+    parents = np.array(
+        [list(matrix) for matrix in parentInverseMatrices],
+        dtype=np.float64).reshape(-1, 4, 4)
+
+    return [om.MMatrix(matrix.ravel().tolist())
+            for matrix in np.matmul(world, parents)]
+
+
+def _localValues(dagPath, localMatrix):
+    """Decompose the given local matrix in the translate, rotate and scale
+    values of the given transform, taking care of its rotate order, rotate
+    axis and joint orient.
+
+    :param dagPath: Transform to decompose the local matrix for.
+    :type dagPath: om.MDagPath
+
+    :param localMatrix: Local matrix of the transform.
+    :type localMatrix: om.MMatrix
+
+    :returns: Translate, rotate (in degrees) and scale values.
+    :rtype: tuple(list, list, list)
+    """
+    transformFn = om.MFnTransform(dagPath)
+    transformation = om.MTransformationMatrix(localMatrix)
+
+    # Remove the rotate axis and the joint orient from the local rotation.
+    rotation = transformation.rotation(asQuaternion=True)
+    rotateAxis = transformFn.rotateOrientation(om.MSpace.kTransform)
+    rotation = rotateAxis.inverse() * rotation
+    if dagPath.hasFn(om.MFn.kJoint):
+        jointOrient = om.MEulerRotation(*[
+            transformFn.findPlug('jointOrient'+axis, False).asMAngle().asRadians()
+            for axis in 'XYZ']).asQuaternion()
+        rotation = rotation * jointOrient.inverse()
+
+    rotateOrder = transformFn.findPlug('rotateOrder', False).asInt()
+    euler = rotation.asEulerRotation().reorderIt(rotateOrder)
+
+    translate = transformation.translation(om.MSpace.kTransform)
+    scale = transformation.scale(om.MSpace.kTransform)
+
+    return (
+        [translate.x, translate.y, translate.z],
+        [om.MAngle(angle).asDegrees() for angle in (euler.x, euler.y, euler.z)],
+        list(scale),
+    )
+
+
+@bulkOperation
 def match(target, destinations, t=True, r=True, s=True):
     """Match the world space transformation(s) of the given objects.
 
+    All the matrices are read in one pass through the api, the local results
+    are computed in bulk and written back in one bulk operation (one undo
+    chunk, no refresh in between).
+
     :param target: Source object.
     :type target: str
 
-    :param destinations: [description]
-    :type destinations: [type]
+    :param destinations: Object(s) to match on the target.
+    :type destinations: str or list
 
     :param t: defaults to True
+        If True, will match the translations of the given object(s).
     :type t: bool, optional
 
     :param r: defaults to True
+        If True, will match the rotations of the given object(s).
     :type r: bool, optional
 
-    :param s: [description], defaults to True
+    :param s: defaults to True
+        If True, will match the scales of the given object(s).
     :type s: bool, optional
     """
     if isinstance(destinations, basestring):
         destinations = [destinations]
+    destinations = [str(destination) for destination in destinations]
+
+    if not (destinations and any((t, r, s))):
+        return
+
+    targetPath = openMayaUtils.getDagPath(str(target))
+    destinationPaths = openMayaUtils.getDagPath(destinations)
 
-    target = pm.PyNode(target)
-    destinations = pm.PyNode(destinations)
+    # Get the target object matrix and the destination parent matrices.
+    targetMatrix = targetPath.inclusiveMatrix()
+    parentInverseMatrices = [
+        path.exclusiveMatrixInverse() for path in destinationPaths]
 
-    # Get the target object matrix.
-    targetMatrix = target.worldMatrix.get()
+    localMatrices = _localMatrices(targetMatrix, parentInverseMatrices)
 
-    # Apply the target matrix to the given destinations objects.
-    for destination in destinations:
-        destinationMatrix = destination.parentInverseMatrix.get() * targetMatrix
+    # Apply the local matrices to the given destinations objects.
+    for path, localMatrix in zip(destinationPaths, localMatrices):
+        name = path.fullPathName()
+        translate, rotate, scale = _localValues(path, localMatrix)
 
-        if all((t,r,x)):
-            destination.setTransformation(destinationMatrix)
-        else:
-            if t: destination.setTranslation(destinationMatrix.translate)
-            if r: destination.setRotation(destinationMatrix.rotate)
-            if s: destination.setScale(destinationMatrix.scale)
+        if t: mc.setAttr(name+'.translate', *translate)
+        if r: mc.setAttr(name+'.rotate', *rotate)
+        if s: mc.setAttr(name+'.scale', *scale)
 
 
+def _channelState(plug):
+    """Return the reason why the given plug can't be set, or None.
+    A keyed plug can be set, only the other connections are reported, as in
+    rigIO.channelbox.
+
+    :param plug: Plug to check.
+    :type plug: om.MPlug
+
+    :rtype: str or None
+    """
+    if plug.isLocked:
+        return 'locked'
+    if plug.isDestination and \
+            not plug.source().node().hasFn(om.MFn.kAnimCurve):
+        return 'connected'
+    return None
+
+
+@bulkOperation
 def clearLocal(transforms, t=True, r=True, s=True):
     """Clear the local transformation(s) of the given transform object(s).
 
-    :param transforms: [description]
+    The lock and connection state of all the target channels is read first,
+    then each channel is reset with a single compound setAttr when its three
+    axes are free, or with one setAttr per free axis otherwise. Everything is
+    done in one bulk operation.
+
+    :param transforms: Transform object(s) to clear.
     :type transforms: str or list
 
     :param t: defaults to True
@@ -60,26 +174,51 @@ def clearLocal(transforms, t=True, r=True, s=True):
         If True, will clear the scales XYZ of the given object(s).
         Else the scales will be ignore during the clear process.
     :type s: bool, optional
+
+    :returns: Skipped plug names and the reason ('locked' or 'connected')
+        they were skipped for.
+    :rtype: dict{str:str}
     """
     if isinstance(transforms, basestring):
         transforms = [transforms]
-
-    transforms = pm.PyNode(transforms)
-
-    for transform in transforms:
-        for axis in 'xyz':
-            if t:
-                try:
-                    transform.attr('t'+axis).set(0)
-                except:
-                    pass
-            if r:
-                try:
-                    transform.attr('r'+axis).set(0)
-                except:
-                    pass
-            if s:
-                try:
-                    transform.attr('s'+axis).set(1)
-                except:
-                    pass
+    transforms = [str(transform) for transform in transforms]
+
+    channels = [(name, value) for name, value, state in
+                (('translate', 0, t), ('rotate', 0, r), ('scale', 1, s))
+                if state]
+    if not (transforms and channels):
+        return {}
+
+    # Get the state of all the target channels in one pass.
+    skipped = {}
+    sets = []
+    for path in openMayaUtils.getDagPath(transforms):
+        nodeFn = om.MFnDependencyNode(path.node())
+        name = path.fullPathName()
+
+        for channel, value in channels:
+            plug = nodeFn.findPlug(channel, False)
+            state = _channelState(plug)
+            if state:
+                skipped[name+'.'+channel] = state
+                continue
+
+            free = []
+            for index in range(plug.numChildren()):
+                child = plug.child(index)
+                childState = _channelState(child)
+                childName = name+'.'+child.partialName(useLongNames=True)
+                if childState:
+                    skipped[childName] = childState
+                else:
+                    free.append(childName)
+
+            if len(free) == plug.numChildren():
+                sets.append((name+'.'+channel, (value,)*len(free)))
+            else:
+                sets.extend((childName, (value,)) for childName in free)
+
+    for plugName, values in sets:
+        mc.setAttr(plugName, *values)
+
+    return skipped